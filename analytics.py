@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from errors import InvalidRequest
+from price_store import BLOCK_TIME
+
+
+METRICS = ("returns", "log_returns", "volatility", "moving_average", "drawdown", "correlation")
+
+
+def check_metric(metric: str, window: int):
+    """Reject unknown metrics and empty windows before any work is done."""
+    if metric not in METRICS:
+        raise InvalidRequest(f"Unknown metric: {metric}")
+    if window < 1:
+        raise InvalidRequest("window must be at least 1 sample")
+
+
+def periods_per_year(step: int) -> float:
+    """Samples per year at a sampling step of ``step`` blocks."""
+    return 365 * 24 * 3600 / (step * BLOCK_TIME)
+
+
+def compute_metric(frame: pd.DataFrame, metric: str, window: int, step: int) -> pd.DataFrame:
+    """Derive ``metric`` column-wise from a block-indexed price frame.
+
+    ``window`` is a number of samples for the rolling metrics. Volatility is the
+    rolling standard deviation of log returns, annualized for the sampling step.
+    ``correlation`` returns the netuid x netuid matrix of log-return correlations.
+    """
+    check_metric(metric, window)
+    if metric == "returns":
+        return frame.pct_change(fill_method=None)
+    if metric == "moving_average":
+        return frame.rolling(window, min_periods=1).mean()
+    if metric == "drawdown":
+        return frame / frame.cummax() - 1
+
+    log_returns = np.log(frame).diff()
+    if metric == "log_returns":
+        return log_returns
+    if metric == "volatility":
+        return log_returns.rolling(window, min_periods=2).std() * np.sqrt(periods_per_year(step))
+    return log_returns.corr(min_periods=2)
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pandas as pd
+
+from block_follower import ingest_block
+from price_store import PriceStore, FINALITY_DEPTH, STEP
+from rpc_scheduler import rpc_scheduler, BULK
+from subnet_registry import load_subnets
+from subtensor_pool import SubtensorPool, LITE
+
+
+class BackfillProgress:
+    """Counts processed blocks and prints throughput at a fixed interval."""
+
+    def __init__(self, total: int, report_interval: float = 5.0):
+        self.total = total
+        self.report_interval = report_interval
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    @property
+    def blocks_per_sec(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def advance(self, failed: bool = False):
+        self.done += 1
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._last_report >= self.report_interval:
+            self._last_report = now
+            self.report()
+
+    def report(self):
+        rate = self.blocks_per_sec
+        remaining = self.total - self.done
+        eta = remaining / rate if rate > 0 else 0.0 if remaining == 0 else float("inf")
+        print(
+            f"{self.done}/{self.total} blocks, {self.failed} failed, "
+            f"{rate:.1f} blocks/sec, ETA {eta:.0f}s"
+        )
+
+
+async def backfill(
+    pool: SubtensorPool,
+    store: PriceStore,
+    netuids: list[int],
+    start_block: int,
+    end_block: int,
+    step: int = STEP,
+    workers: int = 8,
+    retries: int = 3,
+) -> BackfillProgress:
+    """Backfill the store with every subnet's price over a block range.
+
+    Blocks already stored for all ``netuids`` are skipped and each block is
+    committed as soon as it lands, so an interrupted run resumes where it left
+    off. ``workers`` tasks each issue one all-subnets query per block, spread
+    over the pool's archive nodes.
+    """
+    head_hash = await pool.call(LITE, "substrate.get_chain_head")
+    head_block = await pool.call(LITE, "substrate.get_block_number", head_hash)
+    end_block = min(end_block, head_block - FINALITY_DEPTH)
+
+    start_block = -(-max(0, start_block) // step) * step
+    covered = store.covered_blocks(netuids, start_block, end_block)
+    pending = [bn for bn in range(start_block, end_block + 1, step) if bn not in covered]
+    print(f"{len(covered)} blocks already stored, {len(pending)} to fetch")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for block_num in pending:
+        queue.put_nowait(block_num)
+    progress = BackfillProgress(len(pending))
+
+    async def worker():
+        while not queue.empty():
+            block_num = queue.get_nowait()
+            for attempt in range(retries):
+                try:
+                    await ingest_block(pool, store, block_num, netuids)
+                    progress.advance()
+                    break
+                except Exception as e:
+                    if attempt == retries - 1:
+                        print(f"Block {block_num} failed: {e}")
+                        progress.advance(failed=True)
+                    else:
+                        await asyncio.sleep(2 ** attempt)
+
+    with rpc_scheduler.lane(BULK):
+        await asyncio.gather(*[worker() for _ in range(max(1, workers))])
+    progress.report()
+    return progress
+
+
+def export_parquet(
+    store: PriceStore,
+    netuids: list[int],
+    start_block: int,
+    end_block: int,
+    path: str,
+):
+    """Write the stored (netuid, block, price) rows of a range to a Parquet file."""
+    table = pd.DataFrame.from_records(
+        store.iter_prices(netuids, start_block, end_block),
+        columns=["netuid", "block", "price"],
+    )
+    table.to_parquet(path, index=False)
+    print(f"Wrote {len(table)} rows to {path}")
+
+
+async def run_backfill(
+    netuids: list[int] | None,
+    start_block: int,
+    end_block: int,
+    step: int = STEP,
+    workers: int = 8,
+    parquet: str | None = None,
+):
+    """Entry point of the ``backfill`` command, over every registered subnet unless ``netuids`` is given."""
+    pool = SubtensorPool(size=workers)
+    store = PriceStore()
+    await pool.open()
+    try:
+        if not netuids:
+            labels = await load_subnets(pool)
+            store.put_subnets(labels)
+            netuids = list(labels)
+        await backfill(pool, store, netuids, start_block, end_block, step, workers)
+        if parquet:
+            export_parquet(store, netuids, start_block, end_block, parquet)
+    finally:
+        await pool.close()
+        store.close()
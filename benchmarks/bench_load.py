@@ -0,0 +1,161 @@
+"""Load scenarios against the price endpoints, served by a local mock substrate node.
+
+Run from the repository root:
+
+    python benchmarks/bench_load.py
+    python benchmarks/bench_load.py --hours 24 --subnets 1 64 --clients 1 32 --latency 0.05
+
+Every scenario runs three phases, each repeated ``--rounds`` times:
+
+    cold    empty store and response cache
+    store   store populated by the cold phase, empty response cache
+    cached  response cache warm
+
+and reports p50/p99 request latency, RPCs sent to the mock node per round and
+peak traced memory. ``--latency``, ``--jitter`` and ``--error-rate`` take a
+number for every RPC or ``method=number`` for one, e.g.
+``--latency 0.02 get_subnet_dynamic_info=0.2``.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+WORK_DIR = tempfile.mkdtemp(prefix="bench_load_")
+os.environ.setdefault("PRICE_DB_PATH", os.path.join(WORK_DIR, "store.sqlite3"))
+os.environ.setdefault("PRICE_FOLLOWER", "0")
+
+import main
+import subtensor_pool
+from fastapi_cache import FastAPICache
+from price_store import PriceStore
+from mock_subtensor import MockChain, METHODS
+
+
+PHASES = ("cold", "store", "cached")
+
+
+def per_method(values: list[str]) -> float | dict:
+    parsed = {}
+    for value in values:
+        method, _, number = value.rpartition("=")
+        if method and method not in METHODS:
+            raise SystemExit(f"Unknown RPC {method}, expected one of {', '.join(METHODS)}")
+        parsed[method or "default"] = float(number)
+    return parsed
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+def request_path(hours: int, subnets: int) -> str:
+    # Deadline 0 waits for every point, so latencies are not capped by the SLO
+    if subnets == 1:
+        return f"/price_data?netuid=1&interval_hours={hours}&deadline=0"
+    netuids = ",".join(str(netuid) for netuid in range(1, subnets + 1))
+    return f"/price_data_multiple?netuid={netuids}&interval_hours={hours}&deadline=0"
+
+
+async def reset(phase: str, round_no: int):
+    if phase == "cold":
+        main.price_store.close()
+        store = PriceStore(os.path.join(WORK_DIR, f"store-{time.monotonic_ns()}.sqlite3"))
+        # Everything holding the store must move to the new one, not write to the closed one
+        main.price_store = store
+        main.subnet_registry.store = store
+        main.block_follower.store = store
+        main.store_watcher.store = store
+    if phase in ("cold", "store"):
+        await FastAPICache.get_backend().clear()
+        # Hashes and snapshots cached in memory would hide the store's cost
+        main.single_flight._calls.clear()
+
+
+async def wave(client: httpx.AsyncClient, path: str, clients: int) -> list[float]:
+    async def one():
+        started = time.perf_counter()
+        response = await client.get(path)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+        return elapsed
+
+    return await asyncio.gather(*[one() for _ in range(clients)])
+
+
+async def run_scenario(client, chain: MockChain, hours: int, subnets: int, clients: int, rounds: int, seed: int):
+    path = request_path(hours, subnets)
+    results = []
+    for phase in PHASES:
+        latencies = []
+        chain.reset(seed)
+        tracemalloc.reset_peak()
+        for round_no in range(rounds):
+            await reset(phase, round_no)
+            latencies += await wave(client, path, clients)
+        _, peak = tracemalloc.get_traced_memory()
+        results.append((phase, latencies, sum(chain.calls.values()) / rounds, peak))
+    return results
+
+
+async def run(args):
+    chain = MockChain(
+        latency=per_method(args.latency),
+        jitter=per_method(args.jitter),
+        error_rate=per_method(args.error_rate),
+        seed=args.seed,
+    )
+    subtensor_pool.SubtensorInterface = chain.interface
+
+    await main.startup()
+    tracemalloc.start()
+    transport = httpx.ASGITransport(app=main.app)
+    print(f"{'hours':>5} {'subnets':>7} {'clients':>7} {'phase':<6} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'rpcs':>7} {'peak MB':>8}")
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for hours in args.hours:
+                for subnets in args.subnets:
+                    for clients in args.clients:
+                        scenario = await run_scenario(
+                            client, chain, hours, subnets, clients, args.rounds, args.seed
+                        )
+                        for phase, latencies, rpcs, peak in scenario:
+                            print(
+                                f"{hours:>5} {subnets:>7} {clients:>7} {phase:<6} "
+                                f"{percentile(latencies, 50) * 1000:>9.1f} "
+                                f"{percentile(latencies, 99) * 1000:>9.1f} "
+                                f"{rpcs:>7.0f} {peak / 2**20:>8.1f}"
+                            )
+    finally:
+        tracemalloc.stop()
+        await main.shutdown()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=int, nargs="+", default=[1, 24, 168])
+    parser.add_argument("--subnets", type=int, nargs="+", default=[1, 16, 200])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", nargs="+", default=["0.02"])
+    parser.add_argument("--jitter", nargs="+", default=["0.01"])
+    parser.add_argument("--error-rate", nargs="+", default=["0"])
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,116 @@
+"""Compare the default FastAPI encode path with the fast paths used by the price endpoints.
+
+Run from the repository root:
+
+    python benchmarks/bench_serialization.py
+"""
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from chart_builder import line_chart_json
+from fast_json import dumps, orjson
+from plotly_style import dark_template
+
+
+BLOCKS = list(range(0, 169 * 300, 300))  # one week of hourly samples
+NETUIDS = list(range(1, 65))
+
+
+def make_rows():
+    return [{"block": block, "price": random.uniform(0.001, 1.0)} for block in BLOCKS]
+
+
+def make_frame():
+    return pd.DataFrame(
+        {f"SN{netuid}": np.random.uniform(0.001, 1.0, len(BLOCKS)) for netuid in NETUIDS},
+        index=pd.Index(BLOCKS, name="block"),
+    )
+
+
+def make_figure(rows):
+    df = pd.DataFrame(rows)
+    return go.Figure(
+        data=[go.Scatter(x=df["block"], y=df["price"], mode="lines", name="Price")],
+        layout=go.Layout(
+            template=dark_template,
+            title="Subnet 1 Price History",
+            xaxis_title="Block Number",
+            yaxis_title="Price",
+        ),
+    )
+
+
+def bench(name, old, new, number):
+    old_ms = timeit.timeit(old, number=number) / number * 1000
+    new_ms = timeit.timeit(new, number=number) / number * 1000
+    print(f"{name:<24} {old_ms:>10.3f} {new_ms:>10.3f} {old_ms / new_ms:>8.1f}x")
+
+
+def main():
+    rows = make_rows()
+    frame = make_frame()
+    per_subnet = {
+        column: [{"block": block, "price": price} for block, price in frame[column].items()]
+        for column in frame.columns
+    }
+    fig = make_figure(rows)
+    response = JSONResponse(content=None)
+
+    def old_multiple():
+        combined = {}
+        for label, result in per_subnet.items():
+            for data in result:
+                block = data["block"]
+                if block not in combined:
+                    combined[block] = {"block": block}
+                combined[block][label] = data["price"]
+        combined_list = sorted(combined.values(), key=lambda x: x["block"])
+        return response.render(jsonable_encoder(combined_list))
+
+    print(f"orjson: {'yes' if orjson is not None else 'no (stdlib json fallback)'}")
+    print(f"{'payload':<24} {'old ms':>10} {'new ms':>10} {'speedup':>9}")
+    bench(
+        "price_data (1 week)",
+        lambda: response.render(jsonable_encoder(rows)),
+        lambda: dumps(rows),
+        number=200,
+    )
+    bench(
+        "price_data_multiple (64)",
+        old_multiple,
+        lambda: frame.reset_index().to_json(orient="records"),
+        number=20,
+    )
+    bench(
+        "price_chart (1 week)",
+        lambda: response.render(jsonable_encoder(json.loads(fig.to_json()))),
+        lambda: fig.to_json().encode(),
+        number=20,
+    )
+    bench(
+        "price_chart build+encode",
+        lambda: make_figure(rows).to_json().encode(),
+        lambda: line_chart_json(
+            [row["block"] for row in rows],
+            [row["price"] for row in rows],
+            title="Subnet 1 Price History",
+            xaxis_title="Block Number",
+            yaxis_title="Price",
+        ),
+        number=20,
+    )
+
+
+if __name__ == "__main__":
+    main()
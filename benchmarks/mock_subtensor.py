@@ -0,0 +1,123 @@
+"""Local stand-in for btcli's SubtensorInterface, for benchmarks that must not touch a network.
+
+Every RPC sleeps for a configurable latency plus jitter and fails at a
+configurable rate. Prices are a deterministic function of netuid and block, so
+runs with the same seed are reproducible.
+"""
+import asyncio
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+
+METHODS = (
+    "get_chain_head",
+    "get_block_number",
+    "get_block_hash",
+    "get_subnet_dynamic_info",
+    "get_all_subnet_dynamic_info",
+)
+
+
+class MockChain:
+    """Shared state and timing of the mock node behind every MockSubtensorInterface."""
+
+    def __init__(
+        self,
+        head_block: int = 4_000_000,
+        subnets: int = 208,
+        latency: float | dict = 0.02,
+        jitter: float | dict = 0.01,
+        error_rate: float | dict = 0.0,
+        seed: int = 0,
+    ):
+        self.head_block = head_block
+        self.subnets = subnets
+        self.latency = self._per_method(latency)
+        self.jitter = self._per_method(jitter)
+        self.error_rate = self._per_method(error_rate)
+        self.rng = random.Random(seed)
+        self.calls = Counter()
+        self.errors = Counter()
+
+    @staticmethod
+    def _per_method(value: float | dict) -> dict:
+        if isinstance(value, dict):
+            default = value.get("default", 0.0)
+            return {method: value.get(method, default) for method in METHODS}
+        return dict.fromkeys(METHODS, value)
+
+    def reset(self, seed: int = 0):
+        self.rng.seed(seed)
+        self.calls.clear()
+        self.errors.clear()
+
+    def interface(self, network: str = "mock") -> "MockSubtensorInterface":
+        """Factory with the ``SubtensorInterface(network)`` signature."""
+        return MockSubtensorInterface(self)
+
+    async def rpc(self, method: str):
+        self.calls[method] += 1
+        await asyncio.sleep(self.latency[method] + self.rng.uniform(0, self.jitter[method]))
+        if self.rng.random() < self.error_rate[method]:
+            self.errors[method] += 1
+            raise ConnectionError(f"mock {method} failed")
+
+    def price(self, netuid: int, block: int) -> SimpleNamespace:
+        tao = round(netuid / 100 + (block % 7200) / 1e6, 9)
+        return SimpleNamespace(tao=tao)
+
+    def dynamic_info(self, netuid: int, block: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            netuid=netuid, subnet_name=f"mock{netuid}", price=self.price(netuid, block)
+        )
+
+
+def block_hash(block: int) -> str:
+    return f"0x{block:064x}"
+
+
+def hash_block(block_hash: str) -> int:
+    return int(block_hash, 16)
+
+
+class MockSubstrate:
+    def __init__(self, chain: MockChain):
+        self.chain = chain
+
+    async def get_chain_head(self) -> str:
+        await self.chain.rpc("get_chain_head")
+        return block_hash(self.chain.head_block)
+
+    async def get_block_number(self, block_hash: str) -> int:
+        await self.chain.rpc("get_block_number")
+        return hash_block(block_hash)
+
+    async def get_block_hash(self, block: int) -> str | None:
+        await self.chain.rpc("get_block_hash")
+        return block_hash(block) if block <= self.chain.head_block else None
+
+
+class MockSubtensorInterface:
+    """Implements the part of SubtensorInterface the price API uses."""
+
+    def __init__(self, chain: MockChain):
+        self.chain = chain
+        self.substrate = MockSubstrate(chain)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def get_subnet_dynamic_info(self, netuid: int, block_hash: str):
+        await self.chain.rpc("get_subnet_dynamic_info")
+        if not 0 <= netuid < self.chain.subnets:
+            return None
+        return self.chain.dynamic_info(netuid, hash_block(block_hash))
+
+    async def get_all_subnet_dynamic_info(self, block_hash: str):
+        await self.chain.rpc("get_all_subnet_dynamic_info")
+        block = hash_block(block_hash)
+        return [self.chain.dynamic_info(netuid, block) for netuid in range(self.chain.subnets)]
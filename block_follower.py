@@ -0,0 +1,248 @@
+import asyncio
+import os
+import time
+
+from leader_lock import LeaderLock
+from price_store import PriceStore, BLOCK_TIME, FINALITY_DEPTH, STEP
+from rpc_scheduler import rpc_scheduler, BULK
+from subtensor_pool import SubtensorPool, ARCHIVE, LITE
+
+
+PRICE_FOLLOWER = os.getenv("PRICE_FOLLOWER", "0") == "1"
+# How far back the follower backfills when it starts with an empty or stale store
+FOLLOWER_CATCH_UP_HOURS = int(os.getenv("FOLLOWER_CATCH_UP_HOURS", "168"))
+
+
+async def all_subnet_prices(pool: SubtensorPool, block_hash: str) -> dict[int, float]:
+    """Price of every subnet at a block, from a single all-subnets dynamic-info query."""
+    subnet_infos = await pool.call(ARCHIVE, "get_all_subnet_dynamic_info", block_hash)
+    return {
+        subnet_info.netuid: float(subnet_info.price.tao)
+        for subnet_info in subnet_infos or []
+        if subnet_info is not None
+    }
+
+
+async def ingest_block(pool: SubtensorPool, store: PriceStore, block_num: int, netuids: list[int]):
+    """Record one finalized block's hash and every subnet's price, NULL for ``netuids`` absent from it.
+
+    Returns the stored block prices keyed by netuid.
+    """
+    block_hash = await pool.call(ARCHIVE, "substrate.get_block_hash", block_num)
+    store.put_block_hashes({block_num: block_hash})
+
+    prices = {
+        **{netuid: None for netuid in netuids},
+        **await all_subnet_prices(pool, block_hash),
+    }
+    store.put_block_prices(block_num, prices)
+    return prices
+
+
+class BlockFollower:
+    """Background task that ingests every subnet's price at each step boundary.
+
+    The follower polls the chain head once per block and, whenever a new
+    finalized STEP boundary appears, records the price of every followed
+    subnet into the store. After downtime it catches up from the last stored
+    boundary (bounded by ``catch_up_hours``) before following the head again.
+    """
+
+    def __init__(
+        self,
+        pool: SubtensorPool,
+        store: PriceStore,
+        netuids: list[int],
+        poll_interval: float = BLOCK_TIME,
+        catch_up_hours: int = FOLLOWER_CATCH_UP_HOURS,
+    ):
+        self.pool = pool
+        self.store = store
+        self.netuids = netuids
+        self.poll_interval = poll_interval
+        self.catch_up_blocks = catch_up_hours * 3600 // BLOCK_TIME
+        self._task: asyncio.Task | None = None
+        # Called with (block, prices) after every ingested boundary
+        self.listeners = []
+
+        self.mode = "stopped"
+        self.head_block: int | None = None
+        self.last_ingested_block: int | None = None
+        self.last_poll: float | None = None
+        self.boundaries_ingested = 0
+        self.last_error: str | None = None
+
+    def start(self):
+        if self._task is None:
+            self.mode = "starting"
+            with rpc_scheduler.lane(BULK):
+                self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.mode = "stopped"
+
+    def is_live(self) -> bool:
+        """True when the store is known to hold every followed subnet up to the latest finalized boundary."""
+        if self.mode != "following" or self.last_poll is None or self.last_ingested_block is None:
+            return False
+        return time.monotonic() - self.last_poll < 3 * self.poll_interval
+
+    def status(self) -> dict:
+        lag_blocks = None
+        if self.head_block is not None and self.last_ingested_block is not None:
+            lag_blocks = self.head_block - self.last_ingested_block
+        return {
+            "mode": self.mode,
+            "head_block": self.head_block,
+            "last_ingested_block": self.last_ingested_block,
+            "lag_blocks": lag_blocks,
+            "lag_seconds": lag_blocks * BLOCK_TIME if lag_blocks is not None else None,
+            "boundaries_ingested": self.boundaries_ingested,
+            "last_error": self.last_error,
+        }
+
+    async def _run(self):
+        self.last_ingested_block = self.store.latest_block(self.netuids)
+        while True:
+            try:
+                await self._poll()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self):
+        head_hash = await self.pool.call(LITE, "substrate.get_chain_head")
+        self.head_block = await self.pool.call(LITE, "substrate.get_block_number", head_hash)
+        finalized = self.head_block - FINALITY_DEPTH
+
+        first = max(0, self.head_block - self.catch_up_blocks)
+        if self.last_ingested_block is not None:
+            first = max(first, self.last_ingested_block + 1)
+        first = -(-first // STEP) * STEP
+        boundaries = list(range(first, finalized + 1, STEP))
+
+        self.mode = "catching_up" if len(boundaries) > 1 else "following"
+        for block_num in boundaries:
+            await self._ingest(block_num)
+        self.mode = "following"
+        self.last_poll = time.monotonic()
+        # Lets the workers replaying the store tell that it is current
+        self.store.put_follower_heartbeat(self.head_block, self.last_ingested_block, time.time())
+
+    async def _ingest(self, block_num: int):
+        prices = await ingest_block(self.pool, self.store, block_num, self.netuids)
+        for listener in self.listeners:
+            listener(block_num, prices)
+        self.last_ingested_block = block_num
+        self.boundaries_ingested += 1
+
+
+class StoreWatcher:
+    """Publishes the boundaries another process ingests, by polling the shared store.
+
+    Workers that lost the follower election run one so their live feed clients
+    still receive every new point without any chain traffic of their own.
+    """
+
+    def __init__(self, store: PriceStore, netuids: list[int], poll_interval: float = BLOCK_TIME):
+        self.store = store
+        self.netuids = netuids
+        self.poll_interval = poll_interval
+        self._task: asyncio.Task | None = None
+        # Called with (block, prices) for every boundary that appears in the store
+        self.listeners = []
+        self.last_seen_block: int | None = None
+        # The leader's last heartbeat: its chain head, latest boundary and Unix time
+        self.heartbeat: tuple[int, int | None, float] | None = None
+
+    @property
+    def head_block(self) -> int | None:
+        return self.heartbeat[0] if self.heartbeat is not None else None
+
+    def is_live(self) -> bool:
+        """True while a caught-up leader keeps the store up to the latest finalized boundary.
+
+        The leader writes a heartbeat after every poll that leaves it caught up. A
+        store is only trusted while that heartbeat is recent and everything up
+        to the leader's latest boundary has been seen here.
+        """
+        if self._task is None or self.heartbeat is None or self.last_seen_block is None:
+            return False
+        _, ingested_block, updated_at = self.heartbeat
+        if ingested_block is None or self.last_seen_block < ingested_block:
+            return False
+        return time.time() - updated_at < 3 * self.poll_interval
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.heartbeat = None
+
+    async def _run(self):
+        self.last_seen_block = self.store.latest_block(self.netuids)
+        self.heartbeat = self.store.get_follower_heartbeat()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            # Read before the prices, so the boundary it names is already stored
+            self.heartbeat = self.store.get_follower_heartbeat()
+            latest = self.store.latest_block(self.netuids)
+            if latest is None or (self.last_seen_block is not None and latest <= self.last_seen_block):
+                continue
+            first = latest if self.last_seen_block is None else self.last_seen_block + 1
+            self._publish(first, latest)
+            self.last_seen_block = latest
+
+    def _publish(self, first: int, last: int):
+        boundaries = sorted(
+            block for block in self.store.covered_blocks(self.netuids, first, last)
+            if block % STEP == 0
+        )
+        if not boundaries:
+            return
+        points: dict[int, dict] = {block: {} for block in boundaries}
+        for netuid, block, price in self.store.iter_prices(self.netuids, boundaries[0], boundaries[-1]):
+            if block in points:
+                points[block][netuid] = price
+        for block in boundaries:
+            for listener in self.listeners:
+                listener(block, points[block])
+
+
+async def follow_when_leader(
+    follower: BlockFollower,
+    watcher: StoreWatcher,
+    lock: LeaderLock,
+    retry_interval: float = BLOCK_TIME,
+):
+    """Run ``follower`` in the one process holding ``lock``.
+
+    Until the lock is won the process replays the store through ``watcher``. The
+    lock is retried every ``retry_interval`` so a worker takes over ingestion
+    when the leader exits.
+    """
+    while not lock.try_acquire():
+        watcher.start()
+        await asyncio.sleep(retry_interval)
+    await watcher.stop()
+    follower.start()
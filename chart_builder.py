@@ -0,0 +1,37 @@
+import json
+
+import plotly.graph_objects as go
+
+from fast_json import dumps
+from plotly_style import dark_template
+
+
+def _template_fragment() -> bytes:
+    """Serialize the dark template once, exactly as plotly emits it inside a figure."""
+    figure = json.loads(go.Figure(layout=go.Layout(template=dark_template)).to_json())
+    return dumps(figure["layout"]["template"])
+
+
+DARK_TEMPLATE_JSON = _template_fragment()
+
+
+def line_chart_json(
+    x,
+    y,
+    title: str,
+    xaxis_title: str,
+    yaxis_title: str,
+    name: str = "Price",
+) -> bytes:
+    """Plotly figure JSON for a single line trace, built without graph_objects validation.
+
+    The output matches ``go.Figure(...).to_json()`` for the same trace and layout,
+    with the pre-serialized dark template spliced in.
+    """
+    data = dumps([{"mode": "lines", "name": name, "x": x, "y": y, "type": "scatter"}])
+    layout = dumps({
+        "title": {"text": title},
+        "xaxis": {"title": {"text": xaxis_title}},
+        "yaxis": {"title": {"text": yaxis_title}},
+    })
+    return b'{"data":' + data + b',"layout":{"template":' + DARK_TEMPLATE_JSON + b"," + layout[1:] + b"}"
@@ -0,0 +1,10 @@
+class InvalidRequest(ValueError):
+    """A request parameter the client got wrong, answered with a 400."""
+
+    status_code = 400
+
+
+class UnknownSubnet(InvalidRequest):
+    """A netuid that is not registered, answered with a 404."""
+
+    status_code = 404
@@ -0,0 +1,61 @@
+import asyncio
+from contextlib import contextmanager
+
+
+# Events buffered per client before the oldest ones are dropped
+LIVE_FEED_QUEUE_SIZE = 64
+
+
+class Subscription:
+    """One client's bounded queue of (block, prices) events for a set of subnets."""
+
+    def __init__(self, netuids: set[int], maxsize: int = LIVE_FEED_QUEUE_SIZE):
+        self.netuids = netuids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def offer(self, block: int, prices: dict[int, float | None]) -> bool:
+        """Queue the subscribed part of a point, returning True if an old one was dropped."""
+        prices = {
+            netuid: price for netuid, price in prices.items()
+            if netuid in self.netuids and price is not None
+        }
+        if not prices:
+            return False
+        dropped = self.queue.full()
+        if dropped:
+            # A slow client loses its oldest point rather than stalling everyone else
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((block, prices))
+        return dropped
+
+
+class PriceBroadcaster:
+    """Fans ingested price points from the single upstream follower out to many clients."""
+
+    def __init__(self):
+        self.subscriptions: set[Subscription] = set()
+        self.published = 0
+        self.dropped = 0
+
+    @contextmanager
+    def subscribe(self, netuids: list[int]):
+        subscription = Subscription(set(netuids))
+        self.subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, block: int, prices: dict[int, float | None]):
+        self.published += 1
+        for subscription in self.subscriptions:
+            self.dropped += subscription.offer(block, prices)
+
+    def status(self) -> dict:
+        return {
+            "subscribers": len(self.subscriptions),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
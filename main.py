@@ -1,21 +1,38 @@
-import json
+import hashlib
+import os
+import time
 from pathlib import Path
 import asyncio
+from collections import deque
+import numpy as np
 import pandas as pd
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import plotly.graph_objects as go
-from plotly_style import dark_template
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
-from fastapi_cache.decorator import cache
 
-from btcli.bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
 from btcli.bittensor_cli.src.bittensor.balances import Balance
+from subtensor_pool import SubtensorPool, ARCHIVE, LITE
+from price_store import PriceStore, BLOCK_TIME, FINALITY_DEPTH, STEP
+from block_follower import (
+    BlockFollower, StoreWatcher, PRICE_FOLLOWER, all_subnet_prices, follow_when_leader
+)
+from leader_lock import LeaderLock
+from subnet_registry import SubnetRegistry
+from rpc_scheduler import rpc_scheduler, BULK
+from response_cache import cache_backend, cache_key
+from single_flight import SingleFlight
+from fast_json import FastJSONResponse, dumps
+from chart_builder import line_chart_json
+from table_formats import MEDIA_TYPES, check_format, content_headers, encode_table
+from live_feed import PriceBroadcaster
+from analytics import METRICS, check_metric, compute_metric
+from metrics import registry, stage
+from errors import InvalidRequest
+from widgets import WidgetConfig
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 origins = [
     "https://pro.openbb.co",
@@ -30,226 +47,194 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cross-origin clients only see the headers listed here
+    expose_headers=["X-Missing-Blocks", "ETag"],
+)
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time to the response headers, per endpoint and netuid"
+)
+CACHE_REQUESTS = registry.counter(
+    "response_cache_requests_total", "Response cache lookups per endpoint, hit or miss"
 )
+PRICE_POINTS = registry.counter(
+    "price_points_total", "Sampled price points by where they came from: store, chain or missing"
+)
+
+
+def netuid_label(netuid: str) -> str:
+    """Metric label for a ``netuid`` parameter, bounded by the registered subnets."""
+    if not netuid:
+        return ""
+    if "," in netuid:
+        return "multiple"
+    # Unregistered values would add a label set per distinct query string
+    if netuid.strip().isdigit() and int(netuid) in subnet_registry.labels:
+        return str(int(netuid))
+    return "other"
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        endpoint=route.path if route is not None else "unmatched",
+        netuid=netuid_label(request.query_params.get("netuid", "")),
+    )
+    return response
+
 
 ROOT_PATH = Path(__file__).parent.resolve()
 
-SUBNETS_LIST = [
-  {"label": "SN1 - Apex", "value": 1},
-  {"label": "SN2 - Omron", "value": 2},
-  {"label": "SN3 - Templar", "value": 3},
-  {"label": "SN4 - Targon", "value": 4},
-  {"label": "SN5 - Kaito", "value": 5},
-  {"label": "SN6 - Infinite Games", "value": 6},
-  {"label": "SN7 - Subvortex", "value": 7},
-  {"label": "SN8 - Taoshi", "value": 8},
-  {"label": "SN9 - Pre-Training", "value": 9},
-  {"label": "SN10 - Sturdy", "value": 10},
-  {"label": "SN11 - Dippy", "value": 11},
-  {"label": "SN12 - Horde", "value": 12},
-  {"label": "SN13 - Data Universe", "value": 13},
-  {"label": "SN14 - Paladin", "value": 14},
-  {"label": "SN15 - De_Val", "value": 15},
-  {"label": "SN16 - BitAds", "value": 16},
-  {"label": "SN17 - Three Gen", "value": 17},
-  {"label": "SN18 - Cortex.t", "value": 18},
-  {"label": "SN19 - Inference", "value": 19},
-  {"label": "SN20 - BitAgent", "value": 20},
-  {"label": "SN21 - Omega", "value": 21},
-  {"label": "SN22 - Metasearch", "value": 22},
-  {"label": "SN23 - SocialTensor", "value": 23},
-  {"label": "SN24 - Omega 2", "value": 24},
-  {"label": "SN25 - Protein Folding", "value": 25},
-  {"label": "SN26 - Tensor Alchemy", "value": 26},
-  {"label": "SN27 - Compute", "value": 27},
-  {"label": "SN28 - S&P500", "value": 28},
-  {"label": "SN29 - ColdInt", "value": 29},
-  {"label": "SN30 - Bettensor", "value": 30},
-  {"label": "SN31 - NASChain", "value": 31},
-  {"label": "SN32 - It's AI", "value": 32},
-  {"label": "SN33 - ReadyAI", "value": 33},
-  {"label": "SN34 - BitMind", "value": 34},
-  {"label": "SN35 - LogicNet", "value": 35},
-  {"label": "SN36 - WOMBO", "value": 36},
-  {"label": "SN37 - Finetuning", "value": 37},
-  {"label": "SN38 - DTS", "value": 38},
-  {"label": "SN39 - EdgeMAxxing", "value": 39},
-  {"label": "SN40 - Chunking", "value": 40},
-  {"label": "SN41 - Sportstensor", "value": 41},
-  {"label": "SN42 - Masa", "value": 42},
-  {"label": "SN43 - Graphite", "value": 43},
-  {"label": "SN44 - Score", "value": 44},
-  {"label": "SN45 - Gen42", "value": 45},
-  {"label": "SN46 - NeuralAI", "value": 46},
-  {"label": "SN47 - CondenseAI", "value": 47},
-  {"label": "SN48 - Nextplace", "value": 48},
-  {"label": "SN49 - Hivebrain", "value": 49},
-  {"label": "SN50 - No Data", "value": 50},
-  {"label": "SN51 - Compute", "value": 51},
-  {"label": "SN52 - Dojo", "value": 52},
-  {"label": "SN53 - Effi", "value": 53},
-  {"label": "SN54 - Brainlock", "value": 54},
-  {"label": "SN55 - Precog", "value": 55},
-  {"label": "SN56 - Gradient", "value": 56},
-  {"label": "SN57 - Gaia", "value": 57},
-  {"label": "SN58 - Dippy Speech", "value": 58},
-  {"label": "SN59 - AgentArena", "value": 59},
-  {"label": "SN60 - No Data", "value": 60},
-  {"label": "SN61 - Redteam", "value": 61},
-  {"label": "SN62 - Agentao", "value": 62},
-  {"label": "SN63 - No Data", "value": 63},
-  {"label": "SN64 - Chutes", "value": 64},
-  {"label": "SN65", "value": 65},
-  {"label": "SN66", "value": 66},
-  {"label": "SN67", "value": 67},
-  {"label": "SN68", "value": 68},
-  {"label": "SN69", "value": 69},
-  {"label": "SN70", "value": 70},
-  {"label": "SN71", "value": 71},
-  {"label": "SN72", "value": 72},
-  {"label": "SN73", "value": 73},
-  {"label": "SN74", "value": 74},
-  {"label": "SN75", "value": 75},
-  {"label": "SN76", "value": 76},
-  {"label": "SN77", "value": 77},
-  {"label": "SN78", "value": 78},
-  {"label": "SN79", "value": 79},
-  {"label": "SN80", "value": 80},
-  {"label": "SN81", "value": 81},
-  {"label": "SN82", "value": 82},
-  {"label": "SN83", "value": 83},
-  {"label": "SN84", "value": 84},
-  {"label": "SN85", "value": 85},
-  {"label": "SN86", "value": 86},
-  {"label": "SN87", "value": 87},
-  {"label": "SN88", "value": 88},
-  {"label": "SN89", "value": 89},
-  {"label": "SN90", "value": 90},
-  {"label": "SN91", "value": 91},
-  {"label": "SN92", "value": 92},
-  {"label": "SN93", "value": 93},
-  {"label": "SN94", "value": 94},
-  {"label": "SN95", "value": 95},
-  {"label": "SN96", "value": 96},
-  {"label": "SN97", "value": 97},
-  {"label": "SN98", "value": 98},
-  {"label": "SN99", "value": 99},
-  {"label": "SN100", "value": 100},
-  {"label": "SN101", "value": 101},
-  {"label": "SN102", "value": 102},
-  {"label": "SN103", "value": 103},
-  {"label": "SN104", "value": 104},
-  {"label": "SN105", "value": 105},
-  {"label": "SN106", "value": 106},
-  {"label": "SN107", "value": 107},
-  {"label": "SN108", "value": 108},
-  {"label": "SN109", "value": 109},
-  {"label": "SN110", "value": 110},
-  {"label": "SN111", "value": 111},
-  {"label": "SN112", "value": 112},
-  {"label": "SN113", "value": 113},
-  {"label": "SN114", "value": 114},
-  {"label": "SN115", "value": 115},
-  {"label": "SN116", "value": 116},
-  {"label": "SN117", "value": 117},
-  {"label": "SN118", "value": 118},
-  {"label": "SN119", "value": 119},
-  {"label": "SN120", "value": 120},
-  {"label": "SN121", "value": 121},
-  {"label": "SN122", "value": 122},
-  {"label": "SN123", "value": 123},
-  {"label": "SN124", "value": 124},
-  {"label": "SN125", "value": 125},
-  {"label": "SN126", "value": 126},
-  {"label": "SN127", "value": 127},
-  {"label": "SN128", "value": 128},
-  {"label": "SN129", "value": 129},
-  {"label": "SN130", "value": 130},
-  {"label": "SN131", "value": 131},
-  {"label": "SN132", "value": 132},
-  {"label": "SN133", "value": 133},
-  {"label": "SN134", "value": 134},
-  {"label": "SN135", "value": 135},
-  {"label": "SN136", "value": 136},
-  {"label": "SN137", "value": 137},
-  {"label": "SN138", "value": 138},
-  {"label": "SN139", "value": 139},
-  {"label": "SN140", "value": 140},
-  {"label": "SN141", "value": 141},
-  {"label": "SN142", "value": 142},
-  {"label": "SN143", "value": 143},
-  {"label": "SN144", "value": 144},
-  {"label": "SN145", "value": 145},
-  {"label": "SN146", "value": 146},
-  {"label": "SN147", "value": 147},
-  {"label": "SN148", "value": 148},
-  {"label": "SN149", "value": 149},
-  {"label": "SN150", "value": 150},
-  {"label": "SN151", "value": 151},
-  {"label": "SN152", "value": 152},
-  {"label": "SN153", "value": 153},
-  {"label": "SN154", "value": 154},
-  {"label": "SN155", "value": 155},
-  {"label": "SN156", "value": 156},
-  {"label": "SN157", "value": 157},
-  {"label": "SN158", "value": 158},
-  {"label": "SN159", "value": 159},
-  {"label": "SN160", "value": 160},
-  {"label": "SN161", "value": 161},
-  {"label": "SN162", "value": 162},
-  {"label": "SN163", "value": 163},
-  {"label": "SN164", "value": 164},
-  {"label": "SN165", "value": 165},
-  {"label": "SN166", "value": 166},
-  {"label": "SN167", "value": 167},
-  {"label": "SN168", "value": 168},
-  {"label": "SN169", "value": 169},
-  {"label": "SN170", "value": 170},
-  {"label": "SN171", "value": 171},
-  {"label": "SN172", "value": 172},
-  {"label": "SN173", "value": 173},
-  {"label": "SN174", "value": 174},
-  {"label": "SN175", "value": 175},
-  {"label": "SN176", "value": 176},
-  {"label": "SN177", "value": 177},
-  {"label": "SN178", "value": 178},
-  {"label": "SN179", "value": 179},
-  {"label": "SN180", "value": 180},
-  {"label": "SN181", "value": 181},
-  {"label": "SN182", "value": 182},
-  {"label": "SN183", "value": 183},
-  {"label": "SN184", "value": 184},
-  {"label": "SN185", "value": 185},
-  {"label": "SN186", "value": 186},
-  {"label": "SN187", "value": 187},
-  {"label": "SN188", "value": 188},
-  {"label": "SN189", "value": 189},
-  {"label": "SN190", "value": 190},
-  {"label": "SN191", "value": 191},
-  {"label": "SN192", "value": 192},
-  {"label": "SN193", "value": 193},
-  {"label": "SN194", "value": 194},
-  {"label": "SN195", "value": 195},
-  {"label": "SN196", "value": 196},
-  {"label": "SN197", "value": 197},
-  {"label": "SN198", "value": 198},
-  {"label": "SN199", "value": 199},
-  {"label": "SN200", "value": 200},
-  {"label": "SN201", "value": 201},
-  {"label": "SN202", "value": 202},
-  {"label": "SN203", "value": 203},
-  {"label": "SN204", "value": 204},
-  {"label": "SN205", "value": 205},
-  {"label": "SN206", "value": 206},
-  {"label": "SN207", "value": 207},
-  {"label": "SN208", "value": 208}
-]
+# Blocks resolved ahead of the row currently being streamed
+STREAM_WINDOW = 32
+
+# Sampling levels in blocks. Every level's aligned grid is a subset of the finer
+# ones, so stored hourly samples (and the follower's ingestion) also serve days.
+RESOLUTIONS = {"block": 1, "hour": STEP, "day": 24 * STEP}
+MAX_POINTS = 1000
+# Server-side cap on a request's max_points, each point may cost an RPC
+PRICE_MAX_POINTS = int(os.getenv("PRICE_MAX_POINTS", "2000"))
+# Cache lifetime of windows that lie entirely in finalized history
+IMMUTABLE_TTL = 24 * 3600
+
+# Seconds between keepalive comments on idle live feeds
+LIVE_FEED_KEEPALIVE = 15.0
+# Furthest back a reconnecting live feed client is replayed from the store
+LIVE_FEED_REPLAY_BLOCKS = 24 * STEP
+
+# Seconds a price request waits on the chain before answering with the points it has, 0 waits for all
+PRICE_DEADLINE = float(os.getenv("PRICE_DEADLINE", "10"))
+
+subtensor_pool = SubtensorPool()
+price_store = PriceStore()
+single_flight = SingleFlight()
+
+subnet_registry = SubnetRegistry(subtensor_pool, price_store)
+widget_config = WidgetConfig(str(ROOT_PATH / "widgets.json"))
+
+block_follower = BlockFollower(subtensor_pool, price_store, subnet_registry.netuids())
+price_broadcaster = PriceBroadcaster()
+block_follower.listeners.append(price_broadcaster.publish)
+# Workers sharing the store elect one follower, the others replay what it stores
+store_watcher = StoreWatcher(price_store, block_follower.netuids)
+store_watcher.listeners.append(price_broadcaster.publish)
+
+
+def follow_subnets(netuids: list[int]):
+    block_follower.netuids = netuids
+    store_watcher.netuids = netuids
+
+
+subnet_registry.listeners.append(follow_subnets)
+follower_lock = LeaderLock(f"{price_store.path}.follower.lock")
+follower_election: asyncio.Task | None = None
+
+
+def start_ingestion():
+    """Start the follower election once; the winning worker ingests for all of them."""
+    global follower_election
+    if follower_election is None:
+        follower_election = asyncio.create_task(
+            follow_when_leader(block_follower, store_watcher, follower_lock)
+        )
+
+
+def endpoint_samples(field: str, convert=lambda value: value):
+    return lambda: [
+        ({"url": endpoint["url"]}, convert(endpoint[field]) if endpoint[field] is not None else None)
+        for endpoint in subtensor_pool.status()["endpoints"]
+    ]
+
+
+# Existing status counters, read when /metrics is scraped
+registry.collected("rpc_in_flight", "RPCs currently running", lambda: rpc_scheduler.in_flight)
+registry.collected(
+    "rpc_queue_depth", "RPCs waiting for a slot, per lane",
+    lambda: [({"lane": lane}, depth) for lane, depth in rpc_scheduler.queue_depth().items()],
+)
+registry.collected(
+    "rpc_calls_total", "RPCs issued, per lane",
+    lambda: [({"lane": lane}, calls) for lane, calls in rpc_scheduler.status()["calls"].items()],
+    kind="counter",
+)
+registry.collected(
+    "rpc_hedged_total", "RPC attempts started to race a straggler",
+    lambda: subtensor_pool.hedged, kind="counter",
+)
+registry.collected(
+    "rpc_retried_total", "RPC attempts started after a failed one",
+    lambda: subtensor_pool.retried, kind="counter",
+)
+registry.collected("rpc_node_up", "Whether a node is in rotation", endpoint_samples("up", int))
+registry.collected(
+    "rpc_node_latency_milliseconds", "Smoothed latency of a node per method",
+    lambda: [
+        ({"url": endpoint["url"], "method": method}, latency_ms)
+        for endpoint in subtensor_pool.status()["endpoints"]
+        for method, latency_ms in endpoint["latency_ms"].items()
+    ],
+)
+registry.collected(
+    "rpc_node_calls_total", "RPC attempts per node", endpoint_samples("calls"), kind="counter"
+)
+registry.collected(
+    "rpc_node_errors_total", "Failed RPC attempts per node", endpoint_samples("errors"), kind="counter"
+)
+registry.collected(
+    "single_flight_in_flight", "Distinct computations currently shared", single_flight.in_flight
+)
+registry.collected(
+    "single_flight_started_total", "Computations started",
+    lambda: single_flight.started, kind="counter",
+)
+registry.collected(
+    "single_flight_coalesced_total", "Callers that joined an in-flight computation",
+    lambda: single_flight.coalesced, kind="counter",
+)
+registry.collected(
+    "follower_lag_blocks", "Blocks between the head and the last ingested boundary",
+    lambda: block_follower.status()["lag_blocks"],
+)
+registry.collected(
+    "follower_boundaries_ingested_total", "Step boundaries ingested by the follower",
+    lambda: block_follower.boundaries_ingested, kind="counter",
+)
+registry.collected(
+    "live_feed_subscribers", "Connected live feed clients",
+    lambda: len(price_broadcaster.subscriptions),
+)
+registry.collected(
+    "live_feed_dropped_total", "Live feed points dropped for slow clients",
+    lambda: price_broadcaster.dropped, kind="counter",
+)
 
 
 # Add after app initialization
 @app.on_event("startup")
 async def startup():
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
+    # An invalid widgets.json fails startup rather than every dashboard load
+    widget_config.load(app.routes)
+    FastAPICache.init(cache_backend(), prefix="fastapi-cache")
+    await subtensor_pool.open()
+    await subnet_registry.start()
+    if PRICE_FOLLOWER:
+        start_ingestion()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    if follower_election is not None:
+        follower_election.cancel()
+    await store_watcher.stop()
+    await block_follower.stop()
+    await subnet_registry.stop()
+    follower_lock.release()
+    await subtensor_pool.close()
+    price_store.close()
 
 
 @app.get("/")
@@ -258,150 +243,865 @@ def read_root():
 
 
 @app.get("/widgets.json")
-def get_widgets():
+def get_widgets(request: Request):
     """Widgets configuration file for the OpenBB Custom Backend"""
-    return JSONResponse(
-        content=json.load((Path(__file__).parent.resolve() / "widgets.json").open())
-    )
+    config = widget_config.current()
+    # Revalidated on every load so an edited widgets.json shows up without a restart
+    headers = {"ETag": config.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == config.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=config.body, media_type="application/json", headers=headers)
+
+
+async def get_block_hashes(block_numbers: list[int], current_block: int):
+    """Resolve block hashes, only asking the chain for blocks missing from the store."""
+    if not block_numbers:
+        return []
+    known = price_store.get_block_hashes(min(block_numbers), max(block_numbers))
+    missing = [bn for bn in block_numbers if bn not in known]
+
+    with stage("block_hash"):
+        fetched = await asyncio.gather(*[
+            single_flight.do(
+                ("block_hash", bn),
+                subtensor_pool.call, ARCHIVE, "substrate.get_block_hash", bn,
+            )
+            for bn in missing
+        ])
+    fetched = dict(zip(missing, fetched))
+
+    # Only finalized hashes are immutable and safe to persist
+    price_store.put_block_hashes({
+        bn: bh for bn, bh in fetched.items()
+        if bh is not None and bn <= current_block - FINALITY_DEPTH
+    })
+
+    known.update(fetched)
+    return [known[bn] for bn in block_numbers]
+
+
+async def get_current_block() -> int:
+    """Latest block to sample up to; the follower, or in other workers the store watcher, already knows it."""
+    if block_follower.is_live():
+        return block_follower.last_ingested_block
+    if store_watcher.is_live():
+        return store_watcher.last_seen_block
+    with stage("head"):
+        current_block_hash = await subtensor_pool.call(LITE, "substrate.get_chain_head")
+        return await subtensor_pool.call(LITE, "substrate.get_block_number", current_block_hash)
+
+
+def sample_blocks(
+    current_block: int,
+    interval_hours: int = 24,
+    start_block: int | None = None,
+    end_block: int | None = None,
+    resolution: str = "hour",
+    max_points: int = MAX_POINTS,
+    since_block: int | None = None,
+) -> range:
+    """Sampled block numbers, aligned to the step so repeated requests hit the same blocks.
+
+    The window defaults to the last ``interval_hours`` up to the head. ``resolution="auto"``
+    picks the hour level when it fits in ``max_points`` and the day level otherwise. A
+    window that still exceeds ``max_points`` is downsampled to a multiple of the level step.
+    ``since_block`` keeps only the tail after that block, on the full window's grid.
+    ``max_points`` is capped at ``PRICE_MAX_POINTS``.
+    """
+    max_points = min(max(1, max_points), PRICE_MAX_POINTS)
+    blocks_per_hour = int(3600 / 12)  # ~300 blocks per hour
+
+    end_block = current_block if end_block is None else min(end_block, current_block)
+    if start_block is None:
+        start_block = end_block - blocks_per_hour * interval_hours
+    start_block = max(0, start_block)
+    if start_block > end_block:
+        raise InvalidRequest("start_block must not be after end_block")
+    span = end_block - start_block
+
+    if resolution == "auto":
+        resolution = "hour" if span // RESOLUTIONS["hour"] < max_points else "day"
+    if resolution not in RESOLUTIONS:
+        raise InvalidRequest(f"Unknown resolution: {resolution}")
+    step = RESOLUTIONS[resolution]
+    step *= max(1, -(-(span // step + 1) // max_points))
+
+    if since_block is not None:
+        start_block = max(start_block, since_block + 1)
+    start_block = -(-start_block // step) * step
+    return range(start_block, end_block + 1, step)
+
+
+def step_ttl(current_block: int, block_numbers: range) -> int:
+    """Seconds until the window gains a new sample and cached responses go stale."""
+    end_block = block_numbers.stop - 1
+    if end_block < current_block:
+        # A fixed end in the past never gains samples once it is finalized
+        return IMMUTABLE_TTL if end_block <= current_block - FINALITY_DEPTH else BLOCK_TIME
+
+    step = block_numbers.step
+    next_block = (current_block // step + 1) * step
+    head = current_block
+    if block_follower.is_live():
+        # The follower only ingests a boundary once it is finalized
+        next_block += FINALITY_DEPTH
+        head = block_follower.head_block
+    elif store_watcher.is_live():
+        # Same as above, with the head the leader last reported
+        next_block += FINALITY_DEPTH
+        head = store_watcher.head_block
+    return max(1, (next_block - head) * BLOCK_TIME)
+
+
+def missing_blocks_header(missing: list[int], step: int, max_ranges: int = 32) -> str:
+    """``X-Missing-Blocks`` value: the count, then runs of consecutive samples as ``first-last``.
+
+    Only the first ``max_ranges`` runs are listed, followed by ``...``, so the
+    header stays well under proxy header size limits.
+    """
+    ranges = []
+    for block in sorted(missing):
+        if ranges and block - ranges[-1][1] == step:
+            ranges[-1][1] = block
+        else:
+            ranges.append([block, block])
+    listed = [str(first) if first == last else f"{first}-{last}" for first, last in ranges[:max_ranges]]
+    if len(ranges) > max_ranges:
+        listed.append("...")
+    return f"{len(missing)}; {','.join(listed)}"
+
+
+def window_etag(endpoint: str, block_numbers: range, **params) -> str:
+    """ETag naming the last sampled block of a window, whatever its ``since_block``.
+
+    A client that already holds the window up to that block gets a 304, and one
+    polling with ``since_block`` only receives the tail once the ETag changes.
+    """
+    params.pop("since_block", None)
+    digest = hashlib.blake2b(cache_key("", endpoint, **params).encode(), digest_size=8)
+    last_block = (block_numbers.stop - 1) // block_numbers.step * block_numbers.step
+    return f'"{digest.hexdigest()}-{last_block}"'
+
+
+async def cached_response(
+    endpoint: str,
+    compute,
+    media_type: str = "application/json",
+    headers: dict | None = None,
+    if_none_match: str | None = None,
+    deadline: float | None = None,
+    **params,
+) -> Response:
+    """Serve ``compute()`` through the response cache, expiring at the next step boundary.
+
+    ``compute`` returns the JSON content, or an already encoded body as a string or
+    bytes, together with the head block, the sampled block numbers and the blocks
+    that missed the deadline. Complete responses carry an ETag and a matching
+    ``If-None-Match`` is answered with a 304. Partial ones report the missing blocks
+    in ``X-Missing-Blocks`` and are not cached, so the next request fills the gaps.
+    Only requests with the same ``deadline`` share a computation, a shorter one
+    must not cut short a caller prepared to wait.
+    """
+    backend = FastAPICache.get_backend()
+    key = cache_key(FastAPICache.get_prefix(), endpoint, **params)
+
+    async def compute_and_store():
+        content, current_block, block_numbers, missing = await compute()
+        if isinstance(content, str):
+            body = content.encode()
+        elif isinstance(content, bytes):
+            body = content
+        else:
+            with stage("encode"):
+                body = dumps(content)
+        if missing:
+            return None, body, missing_blocks_header(missing, block_numbers.step)
+        etag = window_etag(endpoint, block_numbers, **params)
+        # The ETag is cached in front of the body so a hit can answer a 304 straight away
+        entry = etag.encode() + b"\n" + body
+        await backend.set(key, entry, expire=step_ttl(current_block, block_numbers))
+        return etag, body, None
+
+    entry = await backend.get(key)
+    CACHE_REQUESTS.inc(endpoint=endpoint, result="miss" if entry is None else "hit")
+    if entry is None:
+        # Identical concurrent requests share a single computation
+        etag, body, missing = await single_flight.do((key, deadline), compute_and_store)
+    else:
+        etag, body = entry.split(b"\n", 1)
+        etag, missing = etag.decode(), None
+
+    headers = dict(headers or {})
+    if missing:
+        headers["X-Missing-Blocks"] = missing
+    else:
+        headers["ETag"] = etag
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def parse_netuids(netuid: str) -> list[int]:
+    """Distinct netuids of a comma-separated ``netuid`` parameter, in order."""
+    try:
+        return sorted({int(n.strip()) for n in netuid.split(",")})
+    except ValueError:
+        raise InvalidRequest(f"Invalid netuid: {netuid}") from None
+
+
+def error_response(e: Exception) -> JSONResponse:
+    """The error body of every endpoint; client errors get their 4xx status, anything else a 500."""
+    status_code = e.status_code if isinstance(e, InvalidRequest) else 500
+    return JSONResponse(content={"error": str(e)}, status_code=status_code)
+
+
+def deadline_after(seconds: float) -> float | None:
+    """Event loop time ``seconds`` from now, or None for no deadline."""
+    if seconds <= 0:
+        return None
+    return asyncio.get_running_loop().time() + seconds
+
+
+async def within_deadline(coros: dict, deadline: float | None) -> dict:
+    """Results of the keyed ``coros`` that complete by the event loop time ``deadline``.
+
+    Keys that time out or fail are left out of the result. Work started through
+    ``single_flight`` keeps running when its waiter is cancelled, so late answers
+    still reach the store. Raises the first error when every coroutine failed.
+    """
+    if not coros:
+        return {}
+    tasks = {asyncio.ensure_future(coro): key for key, coro in coros.items()}
+    timeout = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    results = {tasks[task]: task.result() for task in done if task.exception() is None}
+    if not results and not pending:
+        raise next(iter(done)).exception()
+    return results
 
 
 async def price(
-    subtensor: "SubtensorInterface",
     netuid: int,
     interval_hours: int = 24,
+    current_block: int | None = None,
+    block_numbers: range | None = None,
+    deadline: float | None = None,
 ):
-    """Fetch historical subnet price data and return as JSON."""
-    
-    blocks_per_hour = int(3600 / 12)  # ~300 blocks per hour
-    total_blocks = blocks_per_hour * interval_hours
+    """Fetch historical subnet price data and return as JSON, with the blocks that missed the deadline."""
+    if current_block is None:
+        current_block = await get_current_block()
+    if block_numbers is None:
+        block_numbers = sample_blocks(current_block, interval_hours)
 
-    # Fetch data
-    current_block_hash = await subtensor.substrate.get_chain_head()
-    current_block = await subtensor.substrate.get_block_number(current_block_hash)
+    # Read stored samples first, only the uncovered tail goes to the chain
+    with stage("store_read"):
+        prices = price_store.get_prices(netuid, block_numbers.start, current_block)
+    missing = [bn for bn in block_numbers if bn not in prices]
 
-    # Block range  
-    step = 300
-    start_block = max(0, current_block - total_blocks)
-    block_numbers = range(start_block, current_block + 1, step)
+    # Fetch subnet data for each missing block
+    with stage("fetch"):
+        fetched = await within_deadline({
+            block_num: single_flight.do(
+                ("price", netuid, block_num), fetch_price, netuid, block_num, current_block
+            )
+            for block_num in missing
+        }, deadline)
+    prices.update(fetched)
+    unresolved = [block_num for block_num in missing if block_num not in fetched]
+    PRICE_POINTS.inc(len(block_numbers) - len(missing), source="store")
+    PRICE_POINTS.inc(len(fetched), source="chain")
+    PRICE_POINTS.inc(len(unresolved), source="missing")
 
-    # Fetch all block hashes
-    block_hash_cors = [
-        subtensor.substrate.get_block_hash(bn) for bn in block_numbers
-    ]
-    block_hashes = await asyncio.gather(*block_hash_cors)
+    # Process data
+    with stage("merge"):
+        price_data = []
+        for block_num in block_numbers:
+            if prices.get(block_num) is not None:
+                price_data.append({
+                    "block": block_num,
+                    "price": prices[block_num],
+                    # "unit": Balance.get_unit(netuid)
+                })
+
+    return price_data, unresolved
+
+
+async def price_multiple(
+    netuids: list[int],
+    interval_hours: int = 24,
+    current_block: int | None = None,
+    block_numbers: range | None = None,
+    deadline: float | None = None,
+):
+    """Fetch historical price data for several subnets as a block-indexed frame.
+
+    The frame has one float column per netuid, NaN where the subnet did not exist
+    or the block missed the deadline; the missing blocks are returned alongside.
+    Each missing block costs one all-subnets query, so the RPC count grows with the
+    number of blocks rather than subnets x blocks.
+    """
+    if current_block is None:
+        current_block = await get_current_block()
+    if block_numbers is None:
+        block_numbers = sample_blocks(current_block, interval_hours)
 
-    # Fetch subnet data for each block
-    subnet_info_cors = [
-        subtensor.get_subnet_dynamic_info(netuid, bh) for bh in block_hashes
+    with stage("store_read"):
+        prices = {
+            netuid: price_store.get_prices(netuid, block_numbers.start, current_block)
+            for netuid in netuids
+        }
+    missing = [
+        bn for bn in block_numbers
+        if any(bn not in prices[netuid] for netuid in netuids)
     ]
-    subnet_infos = await asyncio.gather(*subnet_info_cors)
 
-    # Process data
-    price_data = []
-    for block_num, subnet_info in zip(block_numbers, subnet_infos):
-        if subnet_info is not None:
-            price_data.append({
-                "block": block_num,
-                "price": float(subnet_info.price.tao),
-                # "unit": Balance.get_unit(netuid)
-            })
+    with stage("fetch"):
+        snapshots = await within_deadline({
+            block_num: single_flight.do(
+                ("snapshot", tuple(netuids), block_num),
+                fetch_snapshot, netuids, block_num, current_block,
+            )
+            for block_num in missing
+        }, deadline)
+    unresolved = [block_num for block_num in missing if block_num not in snapshots]
+    PRICE_POINTS.inc((len(block_numbers) - len(missing)) * len(netuids), source="store")
+    PRICE_POINTS.inc(len(snapshots) * len(netuids), source="chain")
+    PRICE_POINTS.inc(len(unresolved) * len(netuids), source="missing")
 
-    return price_data
+    with stage("merge"):
+        for block_num, snapshot in snapshots.items():
+            for netuid in netuids:
+                prices[netuid][block_num] = snapshot[netuid]
+
+        frame = pd.DataFrame(
+            {
+                netuid: np.array([prices[netuid].get(bn) for bn in block_numbers], dtype=float)
+                for netuid in netuids
+            },
+            index=pd.Index(np.asarray(block_numbers), name="block"),
+        )
+    return frame, unresolved
+
+
+def price_table(frame: pd.DataFrame, layout: str = "wide", value_name: str = "price") -> pd.DataFrame:
+    """Shape a price frame into the table the endpoint returns.
+
+    ``wide`` gives one row per block with a column per subnet label, ``long`` one
+    row per (block, subnet) pair. Blocks where no subnet has a price are dropped.
+    """
+    frame = frame.dropna(how="all").rename(
+        columns=subnet_registry.label
+    )
+    if layout == "wide":
+        table = frame.reset_index()
+    elif layout == "long":
+        table = (
+            frame.reset_index()
+            .melt(id_vars="block", var_name="subnet", value_name=value_name)
+            .dropna(subset=[value_name])
+            .sort_values("block", kind="stable")
+        )
+    else:
+        raise InvalidRequest(f"Unknown layout: {layout}")
+    return table
+
+
+async def in_order(coros, window: int = STREAM_WINDOW):
+    """Yield the results of ``coros`` in order, running at most ``window`` of them ahead."""
+    pending = deque()
+    try:
+        for coro in coros:
+            pending.append(asyncio.ensure_future(coro))
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # The client went away mid-stream
+        for task in pending:
+            task.cancel()
+
+
+async def fetch_price(
+    netuid: int,
+    block_num: int,
+    current_block: int,
+):
+    """Fetch a subnet's price at a single block from the chain and store it once finalized."""
+    [block_hash] = await get_block_hashes([block_num], current_block)
+    with stage("dynamic_info"):
+        subnet_info = await single_flight.do(
+            ("dynamic_info", netuid, block_hash),
+            subtensor_pool.call, ARCHIVE, "get_subnet_dynamic_info", netuid, block_hash,
+        )
+    value = float(subnet_info.price.tao) if subnet_info is not None else None
+    if block_num <= current_block - FINALITY_DEPTH:
+        price_store.put_prices(netuid, {block_num: value})
+    return value
+
+
+async def fetch_snapshot(
+    netuids: list[int],
+    block_num: int,
+    current_block: int,
+):
+    """Fetch the requested subnets' prices at a single block from one all-subnets query."""
+    [block_hash] = await get_block_hashes([block_num], current_block)
+    with stage("dynamic_info"):
+        snapshot = await single_flight.do(
+            ("all_subnet_prices", block_hash), all_subnet_prices, subtensor_pool, block_hash
+        )
+    snapshot = {**{netuid: None for netuid in netuids}, **snapshot}
+    if block_num <= current_block - FINALITY_DEPTH:
+        price_store.put_block_prices(block_num, snapshot)
+    return {netuid: snapshot[netuid] for netuid in netuids}
+
+
+async def iter_price(netuid: int, interval_hours: int = 24, **window):
+    """Yield price rows in block order as soon as each block resolves."""
+    current_block = await get_current_block()
+    block_numbers = sample_blocks(current_block, interval_hours, **window)
+    stored = price_store.get_prices(netuid, block_numbers.start, current_block)
+
+    async def resolve(block_num):
+        if block_num in stored:
+            return block_num, stored[block_num]
+        return block_num, await fetch_price(netuid, block_num, current_block)
+
+    async for block_num, value in in_order(resolve(bn) for bn in block_numbers):
+        if value is not None:
+            yield {"block": block_num, "price": value}
+
+
+async def iter_price_multiple(netuids: list[int], interval_hours: int = 24, **window):
+    """Yield combined multi-subnet rows in block order as soon as each block resolves."""
+    with rpc_scheduler.lane(BULK):
+        current_block = await get_current_block()
+        block_numbers = sample_blocks(current_block, interval_hours, **window)
+        stored = {
+            netuid: price_store.get_prices(netuid, block_numbers.start, current_block)
+            for netuid in netuids
+        }
+
+        async def resolve(block_num):
+            if all(block_num in stored[netuid] for netuid in netuids):
+                return block_num, {netuid: stored[netuid][block_num] for netuid in netuids}
+            return block_num, await fetch_snapshot(netuids, block_num, current_block)
+
+        async for block_num, prices in in_order(resolve(bn) for bn in block_numbers):
+            row = {"block": block_num}
+            for netuid, value in prices.items():
+                if value is not None:
+                    row[subnet_registry.label(netuid)] = value
+            if len(row) > 1:
+                yield row
+
+
+def sse_event(block: int, prices: dict[int, float]) -> bytes:
+    """A server-sent ``price`` event, with the block number as the event id."""
+    row = {"block": block}
+    for netuid, value in prices.items():
+        row[subnet_registry.label(netuid)] = value
+    return b"id: %d\nevent: price\ndata: " % block + dumps(row) + b"\n\n"
+
+
+async def price_events(netuids: list[int], last_block: int | None = None):
+    """Yield live price events for ``netuids``, replaying stored points after ``last_block`` first."""
+    with price_broadcaster.subscribe(netuids) as subscription:
+        end_block = block_follower.last_ingested_block
+        if end_block is None:
+            # A worker that lost the follower election replays what the leader stored
+            end_block = store_watcher.last_seen_block
+        if last_block is not None and end_block is not None:
+            start_block = max(last_block + 1, end_block - LIVE_FEED_REPLAY_BLOCKS)
+            stored = {
+                netuid: price_store.get_prices(netuid, start_block, end_block)
+                for netuid in netuids
+            }
+            for block in sorted({block for prices in stored.values() for block in prices}):
+                prices = {
+                    netuid: stored[netuid][block] for netuid in netuids
+                    if stored[netuid].get(block) is not None
+                }
+                if prices:
+                    yield sse_event(block, prices)
+            last_block = max(last_block, end_block)
+
+        while True:
+            try:
+                block, prices = await asyncio.wait_for(
+                    subscription.queue.get(), LIVE_FEED_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if last_block is not None and block <= last_block:
+                continue
+            last_block = block
+            yield sse_event(block, prices)
+
+
+async def ndjson(rows):
+    """Encode rows as newline-delimited JSON, reporting a failure as a final error row."""
+    try:
+        async for row in rows:
+            yield dumps(row) + b"\n"
+    except Exception as e:
+        yield dumps({"error": str(e)}) + b"\n"
+
+
+@app.get("/follower_status")
+def get_follower_status():
+    """Returns ingestion progress and lag of the background block follower"""
+    return {
+        **block_follower.status(),
+        "leader": follower_lock.held,
+        "replayed_block": store_watcher.last_seen_block,
+        "live_feed": price_broadcaster.status(),
+    }
+
+@app.get("/rpc_status")
+def get_rpc_status():
+    """Returns in-flight RPCs, queue depth per priority lane, coalesced calls and node health"""
+    return {
+        **rpc_scheduler.status(),
+        **subtensor_pool.status(),
+        "single_flight": {
+            "in_flight": single_flight.in_flight(),
+            "started": single_flight.started,
+            "coalesced": single_flight.coalesced,
+        },
+    }
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus metrics: per-stage and per-endpoint latency, RPC, cache and follower counters"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/subnets")
-def get_subnets():
+def get_subnets(request: Request):
     """Returns list of all subnets with their labels and values"""
-    return SUBNETS_LIST
+    headers = {
+        "ETag": subnet_registry.etag,
+        "Cache-Control": f"max-age={subnet_registry.refresh_interval}",
+    }
+    if request.headers.get("if-none-match") == subnet_registry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=subnet_registry.body, media_type="application/json", headers=headers)
 
 @app.get("/price_data")
-async def get_price_data(netuid: int = 1, interval_hours: int = 24):
+async def get_price_data(
+    request: Request,
+    netuid: int = 1,
+    interval_hours: int = 24,
+    start_block: int | None = None,
+    end_block: int | None = None,
+    resolution: str = "hour",
+    max_points: int = MAX_POINTS,
+    since_block: int | None = None,
+    deadline: float = PRICE_DEADLINE,
+    stream: bool = False,
+):
     """Get historical price data for a subnet"""
+    window = dict(
+        start_block=start_block, end_block=end_block,
+        resolution=resolution, max_points=max_points, since_block=since_block,
+    )
+
+    async def compute():
+        deadline_at = deadline_after(deadline)
+        current_block = await get_current_block()
+        block_numbers = sample_blocks(current_block, interval_hours, **window)
+        result, missing = await price(
+            netuid, interval_hours, current_block, block_numbers, deadline_at
+        )
+        return result, current_block, block_numbers, missing
+
     try:
-        subtensor = SubtensorInterface("test")
-        async with subtensor:
-            result = await price(subtensor, netuid, interval_hours)
-            return result
-    except Exception as e:
-        return JSONResponse(
-            content={"error": str(e)}, 
-            status_code=500
+        subnet_registry.check([netuid])
+        if stream:
+            return StreamingResponse(
+                ndjson(iter_price(netuid, interval_hours, **window)),
+                media_type="application/x-ndjson",
+            )
+
+        return await cached_response(
+            "price_data",
+            compute,
+            if_none_match=request.headers.get("if-none-match"),
+            deadline=deadline,
+            netuid=netuid,
+            interval_hours=interval_hours,
+            **window,
         )
+    except Exception as e:
+        return error_response(e)
 
-# @cache(expire=300)  # Cache for 5 minutes
 @app.get("/price_data_multiple")
-async def get_price_data_multiple(netuid: str = "", interval_hours: int = 24):
-    """Get historical price data for multiple subnets"""
+async def get_price_data_multiple(
+    request: Request,
+    netuid: str = "",
+    interval_hours: int = 24,
+    start_block: int | None = None,
+    end_block: int | None = None,
+    resolution: str = "hour",
+    max_points: int = MAX_POINTS,
+    layout: str = "wide",
+    format: str = "json",
+    compression: str | None = None,
+    since_block: int | None = None,
+    deadline: float = PRICE_DEADLINE,
+    stream: bool = False,
+):
+    """Get historical price data for multiple subnets as JSON, CSV, Parquet or Arrow IPC"""
+    window = dict(
+        start_block=start_block, end_block=end_block,
+        resolution=resolution, max_points=max_points, since_block=since_block,
+    )
+
+    async def compute():
+        # Get price data for all subnets in one batched pass, behind single-subnet requests
+        deadline_at = deadline_after(deadline)
+        with rpc_scheduler.lane(BULK):
+            current_block = await get_current_block()
+            block_numbers = sample_blocks(current_block, interval_hours, **window)
+            frame, missing = await price_multiple(
+                netuid_list, interval_hours, current_block, block_numbers, deadline_at
+            )
+
+        with stage("merge"):
+            table = price_table(frame, layout)
+        with stage("encode"):
+            body = encode_table(table, format, compression)
+        return body, current_block, block_numbers, missing
+
     try:
-        # Parse comma-separated string into list of integers
-        netuid_list = [int(n.strip()) for n in netuid.split(",")]
-
-        subtensor = SubtensorInterface("test")
-        async with subtensor:
-            # Get price data for each subnet
-            results = await asyncio.gather(*[
-                price(subtensor, netuid, interval_hours) 
-                for netuid in netuid_list
-            ])
-            
-            # Combine results by block number
-            combined = {}
-            for netuid, result in zip(netuid_list, results):
-                for data in result:
-                    block = data["block"]
-                    if block not in combined:
-                        combined[block] = {"block": block}
-                    combined[block][SUBNETS_LIST[netuid-1]["label"]] = data["price"]
-            
-            # Convert to list sorted by block
-            combined_list = list(combined.values())
-            combined_list.sort(key=lambda x: x["block"])
-            
-            return combined_list
-            
+        # Parse comma-separated string into a sorted list of unique integers
+        netuid_list = parse_netuids(netuid)
+        subnet_registry.check(netuid_list)
+        if layout not in ("wide", "long"):
+            raise InvalidRequest(f"Unknown layout: {layout}")
+        check_format(format, compression)
+
+        if stream:
+            if format != "json":
+                raise InvalidRequest("Streaming is only available for the json format")
+            return StreamingResponse(
+                ndjson(iter_price_multiple(netuid_list, interval_hours, **window)),
+                media_type="application/x-ndjson",
+            )
+
+        return await cached_response(
+            "price_data_multiple",
+            compute,
+            media_type=MEDIA_TYPES[format],
+            headers=content_headers(format, compression),
+            if_none_match=request.headers.get("if-none-match"),
+            deadline=deadline,
+            netuid=",".join(map(str, netuid_list)),
+            interval_hours=interval_hours,
+            layout=layout,
+            format=format,
+            compression=compression,
+            **window,
+        )
     except Exception as e:
-        return JSONResponse(
-            content={"error": str(e)}, 
-            status_code=500
+        return error_response(e)
+
+
+@app.get("/price_analytics", openapi_extra={"widget_config": {
+    "name": "Subnet Price Analytics",
+    "category": "Bittensor",
+    "type": "table",
+    "gridData": {"w": 40, "h": 16},
+    "params": [
+        {
+            "paramName": "netuid",
+            "label": "Subnet ID",
+            "description": "The subnet IDs to analyse",
+            "type": "endpoint",
+            "optionsEndpoint": "subnets",
+            "multiSelect": True,
+        },
+        {
+            "paramName": "metric",
+            "value": "returns",
+            "label": "Metric",
+            "description": "The metric to derive from the prices",
+            "type": "text",
+            "options": [{"value": metric, "label": metric.replace("_", " ")} for metric in METRICS],
+        },
+        {
+            "paramName": "window",
+            "value": "24",
+            "label": "Window",
+            "description": "Samples in the rolling window of volatility and moving average",
+            "type": "number",
+        },
+        {
+            "paramName": "interval_hours",
+            "value": "24",
+            "label": "Interval Hours",
+            "description": "Number of hours of historical data to analyse",
+            "type": "text",
+            "options": [
+                {"value": "24", "label": "24 hours"},
+                {"value": "72", "label": "72 hours"},
+                {"value": "168", "label": "1 week"},
+            ],
+        },
+    ],
+}})
+async def get_price_analytics(
+    request: Request,
+    netuid: str = "1",
+    metric: str = "returns",
+    window: int = 24,
+    interval_hours: int = 24,
+    start_block: int | None = None,
+    end_block: int | None = None,
+    resolution: str = "hour",
+    max_points: int = MAX_POINTS,
+    layout: str = "wide",
+    format: str = "json",
+    compression: str | None = None,
+    deadline: float = PRICE_DEADLINE,
+):
+    """Returns, volatility, moving average, drawdown or correlation of subnet prices"""
+    window_params = dict(
+        start_block=start_block, end_block=end_block,
+        resolution=resolution, max_points=max_points,
+    )
+
+    async def compute():
+        deadline_at = deadline_after(deadline)
+        with rpc_scheduler.lane(BULK):
+            current_block = await get_current_block()
+            block_numbers = sample_blocks(current_block, interval_hours, **window_params)
+            frame, missing = await price_multiple(
+                netuid_list, interval_hours, current_block, block_numbers, deadline_at
+            )
+
+        with stage("analytics"):
+            result = compute_metric(frame, metric, window, block_numbers.step)
+            if metric == "correlation":
+                label = subnet_registry.label
+                table = result.rename(index=label, columns=label).reset_index(names="subnet")
+            else:
+                table = price_table(result, layout, value_name=metric)
+        with stage("encode"):
+            # Returns and volatility are far below a rao, keep every significant digit
+            body = encode_table(table, format, compression, double_precision=15)
+        return body, current_block, block_numbers, missing
+
+    try:
+        netuid_list = parse_netuids(netuid)
+        subnet_registry.check(netuid_list)
+        check_metric(metric, window)
+        if layout not in ("wide", "long"):
+            raise InvalidRequest(f"Unknown layout: {layout}")
+        check_format(format, compression)
+
+        # Recomputed from the store once a new sample lands, only the new tail costs RPCs
+        return await cached_response(
+            "price_analytics",
+            compute,
+            media_type=MEDIA_TYPES[format],
+            headers=content_headers(format, compression),
+            if_none_match=request.headers.get("if-none-match"),
+            deadline=deadline,
+            netuid=",".join(map(str, netuid_list)),
+            metric=metric,
+            window=window,
+            interval_hours=interval_hours,
+            layout=layout,
+            format=format,
+            compression=compression,
+            **window_params,
         )
+    except Exception as e:
+        return error_response(e)
+
+
+@app.get("/price_stream")
+async def get_price_stream(request: Request, netuid: str = "1"):
+    """Server-sent events with each new price point of the subscribed subnets"""
+    try:
+        netuid_list = parse_netuids(netuid)
+        subnet_registry.check(netuid_list)
+        last_event_id = request.headers.get("last-event-id", "").strip()
+        # Ids are block numbers; anything else did not come from this feed, so nothing is replayed
+        last_block = int(last_event_id) if last_event_id.isdigit() else None
+
+        # Every client shares the follower's single upstream chain subscription
+        start_ingestion()
+
+        return StreamingResponse(
+            price_events(netuid_list, last_block),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except Exception as e:
+        return error_response(e)
 
 
 @app.get("/price_chart") 
-async def get_price_chart(netuid: int = 277, interval_hours: int = 24):
+async def get_price_chart(
+    request: Request,
+    netuid: int = 277,
+    interval_hours: int = 24,
+    start_block: int | None = None,
+    end_block: int | None = None,
+    resolution: str = "hour",
+    max_points: int = MAX_POINTS,
+    deadline: float = PRICE_DEADLINE,
+):
     """Get price chart for a subnet"""
-    try:
-        subtensor = SubtensorInterface("test")
-        async with subtensor:
-            result = await price(subtensor, netuid, interval_hours)
-            
-            # Create DataFrame
-            df = pd.DataFrame(result)
-            
-            # Create plot
-            fig = go.Figure(
-                data=[go.Scatter(
-                    x=df["block"],
-                    y=df["price"],
-                    mode='lines',
-                    name='Price'
-                )],
-                layout=go.Layout(
-                    template=dark_template,
-                    title=f"Subnet {netuid} Price History",
-                    xaxis_title="Block Number",
-                    yaxis_title="Price"
-                )
+    window = dict(
+        start_block=start_block, end_block=end_block,
+        resolution=resolution, max_points=max_points,
+    )
+
+    async def compute():
+        deadline_at = deadline_after(deadline)
+        current_block = await get_current_block()
+        block_numbers = sample_blocks(current_block, interval_hours, **window)
+        result, missing = await price(
+            netuid, interval_hours, current_block, block_numbers, deadline_at
+        )
+
+        # Emit the Plotly figure JSON directly from the price columns
+        with stage("chart"):
+            chart = line_chart_json(
+                x=[row["block"] for row in result],
+                y=[row["price"] for row in result],
+                title=f"Subnet {netuid} Price History",
+                xaxis_title="Block Number",
+                yaxis_title="Price",
             )
-            
-            return json.loads(fig.to_json())
-            
-    except Exception as e:
-        return JSONResponse(
-            content={"error": str(e)},
-            status_code=500
+        return chart, current_block, block_numbers, missing
+
+    try:
+        subnet_registry.check([netuid])
+        return await cached_response(
+            "price_chart",
+            compute,
+            if_none_match=request.headers.get("if-none-match"),
+            deadline=deadline,
+            netuid=netuid,
+            interval_hours=interval_hours,
+            **window,
         )
+    except Exception as e:
+        return error_response(e)
 
 
-if __name__ == "__main__":
+def serve(workers: int = 1):
     try:
         import bittensor
         print("Bittensor version:", bittensor.__version__)
@@ -409,4 +1109,43 @@ if __name__ == "__main__":
         print("Failed to import bittensor:", e)
         
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=5050)
\ No newline at end of file
+    if workers > 1:
+        # Worker processes import the app themselves and share one response cache file
+        os.environ.setdefault("RESPONSE_CACHE_PATH", f"{price_store.path}.cache")
+        uvicorn.run(
+            "main:app", host="127.0.0.1", port=5050, workers=workers, app_dir=str(ROOT_PATH)
+        )
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=5050)
+
+
+if __name__ == "__main__":
+    import argparse
+    from backfill import run_backfill
+
+    parser = argparse.ArgumentParser(description="Bittensor Subnet Price API")
+    commands = parser.add_subparsers(dest="command")
+    serve_parser = commands.add_parser("serve", help="Run the API server (default)")
+    serve_parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes sharing the store and cache"
+    )
+    backfill_parser = commands.add_parser(
+        "backfill", help="Backfill historical subnet prices into the local store"
+    )
+    backfill_parser.add_argument(
+        "--netuids", default="", help="Comma-separated netuids, all known subnets by default"
+    )
+    backfill_parser.add_argument("--start-block", type=int, required=True)
+    backfill_parser.add_argument("--end-block", type=int, required=True)
+    backfill_parser.add_argument("--step", type=int, default=STEP, help="Blocks between samples")
+    backfill_parser.add_argument("--workers", type=int, default=8, help="Parallel connections")
+    backfill_parser.add_argument("--parquet", help="Also export the range to this Parquet file")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        netuids = [int(n.strip()) for n in args.netuids.split(",")] if args.netuids else None
+        asyncio.run(run_backfill(
+            netuids, args.start_block, args.end_block, args.step, args.workers, args.parquet
+        ))
+    else:
+        serve(getattr(args, "workers", 1))
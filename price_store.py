@@ -0,0 +1,171 @@
+import os
+import sqlite3
+from pathlib import Path
+
+
+PRICE_DB_PATH = os.getenv(
+    "PRICE_DB_PATH", str(Path(__file__).parent.resolve() / "price_store.sqlite3")
+)
+
+# Blocks at least this far behind the chain head are treated as finalized and
+# safe to persist. GRANDPA usually finalizes within a couple of blocks.
+FINALITY_DEPTH = int(os.getenv("FINALITY_DEPTH", "10"))
+
+# Prices are sampled every STEP blocks (~1 hour at 12s blocks), aligned to multiples of STEP
+BLOCK_TIME = 12
+STEP = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS block_hashes (
+    block INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+
+-- Clustered on (netuid, block) so a subnet's series is read as one contiguous
+-- range. A NULL price records that the subnet did not exist at that block.
+CREATE TABLE IF NOT EXISTS prices (
+    netuid INTEGER NOT NULL,
+    block INTEGER NOT NULL,
+    price REAL,
+    PRIMARY KEY (netuid, block)
+) WITHOUT ROWID;
+
+-- Last known subnet registry, so a restart without chain access still has labels
+CREATE TABLE IF NOT EXISTS subnets (
+    netuid INTEGER PRIMARY KEY,
+    label TEXT NOT NULL
+);
+
+-- Written by the worker running the follower once it is caught up, so the
+-- other workers can tell whether the store is current
+CREATE TABLE IF NOT EXISTS follower_heartbeat (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    head_block INTEGER NOT NULL,
+    ingested_block INTEGER,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class PriceStore:
+    """Local SQLite store for immutable chain data of finalized blocks."""
+
+    def __init__(self, path: str = PRICE_DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def get_block_hashes(self, start_block: int, end_block: int) -> dict[int, str]:
+        """Return the known block number -> hash entries within [start_block, end_block]."""
+        rows = self._conn.execute(
+            "SELECT block, hash FROM block_hashes WHERE block BETWEEN ? AND ?",
+            (start_block, end_block),
+        )
+        return dict(rows.fetchall())
+
+    def put_block_hashes(self, block_hashes: dict[int, str]):
+        if not block_hashes:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO block_hashes (block, hash) VALUES (?, ?)",
+                block_hashes.items(),
+            )
+
+    def get_prices(self, netuid: int, start_block: int, end_block: int) -> dict[int, float | None]:
+        """Return the stored block -> price samples for a subnet within [start_block, end_block]."""
+        rows = self._conn.execute(
+            "SELECT block, price FROM prices WHERE netuid = ? AND block BETWEEN ? AND ?",
+            (netuid, start_block, end_block),
+        )
+        return dict(rows.fetchall())
+
+    def put_prices(self, netuid: int, prices: dict[int, float | None]):
+        if not prices:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prices (netuid, block, price) VALUES (?, ?, ?)",
+                [(netuid, block, price) for block, price in prices.items()],
+            )
+
+    def put_block_prices(self, block: int, prices: dict[int, float | None]):
+        """Store one block's samples for many subnets in a single transaction."""
+        if not prices:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prices (netuid, block, price) VALUES (?, ?, ?)",
+                [(netuid, block, price) for netuid, price in prices.items()],
+            )
+
+    def latest_block(self, netuids: list[int]) -> int | None:
+        """Highest block with a stored sample for every one of the given subnets."""
+        netuids = sorted(set(netuids))
+        if not netuids:
+            return None
+        placeholders = ",".join("?" * len(netuids))
+        latest, count = self._conn.execute(
+            f"SELECT MIN(latest), COUNT(*) FROM ("
+            f"SELECT netuid, MAX(block) AS latest FROM prices "
+            f"WHERE netuid IN ({placeholders}) GROUP BY netuid)",
+            netuids,
+        ).fetchone()
+        if count < len(netuids):
+            return None
+        return latest
+
+    def covered_blocks(self, netuids: list[int], start_block: int, end_block: int) -> set[int]:
+        """Blocks within [start_block, end_block] that have a stored sample for every given subnet."""
+        netuids = sorted(set(netuids))
+        if not netuids:
+            return set()
+        placeholders = ",".join("?" * len(netuids))
+        rows = self._conn.execute(
+            f"SELECT block FROM prices WHERE netuid IN ({placeholders}) "
+            f"AND block BETWEEN ? AND ? GROUP BY block HAVING COUNT(*) = ?",
+            [*netuids, start_block, end_block, len(netuids)],
+        )
+        return {block for block, in rows}
+
+    def iter_prices(self, netuids: list[int], start_block: int, end_block: int):
+        """Cursor over stored (netuid, block, price) rows, ordered by subnet then block."""
+        netuids = sorted(set(netuids))
+        placeholders = ",".join("?" * len(netuids))
+        return self._conn.execute(
+            f"SELECT netuid, block, price FROM prices WHERE netuid IN ({placeholders}) "
+            f"AND block BETWEEN ? AND ? ORDER BY netuid, block",
+            [*netuids, start_block, end_block],
+        )
+
+    def get_subnets(self) -> dict[int, str]:
+        """Return the stored netuid -> label registry."""
+        return dict(self._conn.execute("SELECT netuid, label FROM subnets ORDER BY netuid"))
+
+    def put_subnets(self, labels: dict[int, str]):
+        """Replace the stored registry."""
+        with self._conn:
+            self._conn.execute("DELETE FROM subnets")
+            self._conn.executemany(
+                "INSERT INTO subnets (netuid, label) VALUES (?, ?)", labels.items()
+            )
+
+    def get_follower_heartbeat(self) -> tuple[int, int | None, float] | None:
+        """Return the follower's last (head_block, ingested_block, updated_at), if any."""
+        return self._conn.execute(
+            "SELECT head_block, ingested_block, updated_at FROM follower_heartbeat"
+        ).fetchone()
+
+    def put_follower_heartbeat(self, head_block: int, ingested_block: int | None, updated_at: float):
+        """Record the follower's chain head and latest ingested boundary, ``updated_at`` in Unix time."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO follower_heartbeat (id, head_block, ingested_block, updated_at) "
+                "VALUES (0, ?, ?, ?)",
+                (head_block, ingested_block, updated_at),
+            )
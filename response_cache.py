@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi_cache.types import Backend
+
+
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Point at a Redis-compatible server to share cached responses between workers
+REDIS_URL = os.getenv("REDIS_URL")
+# SQLite file shared by the workers of one host, used when Redis is not configured
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+
+
+class LRUMemoryBackend(Backend):
+    """In-process cache backend capped at ``max_bytes`` with least-recently-used eviction."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._store: OrderedDict[str, Tuple[bytes, float]] = OrderedDict()
+
+    def _get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._delete(key)
+            return None
+        self._store.move_to_end(key)
+        return entry
+
+    def _delete(self, key: str):
+        data, _ = self._store.pop(key)
+        self.size -= len(data)
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        entry = self._get(key)
+        if entry is None:
+            return 0, None
+        return int(entry[1] - time.monotonic()), entry[0]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._get(key)
+        return entry[0] if entry is not None else None
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        if len(value) > self.max_bytes:
+            return
+        if key in self._store:
+            self._delete(key)
+        expires_at = time.monotonic() + expire if expire else float("inf")
+        self._store[key] = (value, expires_at)
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            self._delete(next(iter(self._store)))
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if namespace:
+            keys = [k for k in self._store if k.startswith(namespace)]
+        elif key:
+            keys = [key] if key in self._store else []
+        else:
+            keys = list(self._store)
+        for k in keys:
+            self._delete(k)
+        return len(keys)
+
+
+class SQLiteBackend(Backend):
+    """Cache backend in a SQLite file that every worker process on the host opens.
+
+    Expiry uses wall-clock time so it agrees between processes. Expired entries,
+    and then the soonest to expire, are pruned once the cached bodies exceed
+    ``max_bytes``, checked every ``prune_interval`` writes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = CACHE_MAX_BYTES, prune_interval: int = 256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        row = self._conn.execute(
+            "SELECT value, expires FROM cache WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            return 0, None
+        return int(row[1] - time.time()), row[0]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_with_ttl(key))[1]
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        if len(value) > self.max_bytes:
+            return
+        expires_at = time.time() + expire if expire else float("inf")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        self._writes += 1
+        if self._writes % self.prune_interval == 0:
+            self.prune()
+
+    def prune(self):
+        self._conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        size, = self._conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()
+        excess = size - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        for key, length in self._conn.execute(
+            "SELECT key, LENGTH(value) FROM cache ORDER BY expires"
+        ):
+            doomed.append((key,))
+            excess -= length
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if namespace:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(namespace), namespace)
+            )
+        elif key:
+            cursor = self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        else:
+            cursor = self._conn.execute("DELETE FROM cache")
+        return cursor.rowcount
+
+
+def cache_backend() -> Backend:
+    """Redis backend when REDIS_URL is set, a shared SQLite file with RESPONSE_CACHE_PATH, otherwise a local LRU backend."""
+    if REDIS_URL:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+
+        return RedisBackend(aioredis.from_url(REDIS_URL))
+    if RESPONSE_CACHE_PATH:
+        return SQLiteBackend(RESPONSE_CACHE_PATH)
+    return LRUMemoryBackend()
+
+
+def cache_key(prefix: str, endpoint: str, **params) -> str:
+    """Stable key for an endpoint call, independent of parameter order."""
+    normalized = ":".join(f"{name}={params[name]}" for name in sorted(params))
+    return f"{prefix}:{endpoint}:{normalized}"
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+RPC_MAX_IN_FLIGHT = int(os.getenv("RPC_MAX_IN_FLIGHT", "64"))
+RPC_MAX_IN_FLIGHT_PER_CONNECTION = int(os.getenv("RPC_MAX_IN_FLIGHT_PER_CONNECTION", "16"))
+
+# Priority lanes, lower runs first
+INTERACTIVE = 0
+BULK = 1
+LANES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+_lane: ContextVar[int] = ContextVar("rpc_lane", default=INTERACTIVE)
+
+
+class RpcScheduler:
+    """Bounds the number of RPCs in flight against the substrate nodes.
+
+    Every call takes a slot from a global limit and from a limit on the
+    connection it runs on. When the global limit is reached, callers queue in
+    the lane of the current context and queued interactive calls are always
+    admitted before bulk ones.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = RPC_MAX_IN_FLIGHT,
+        max_per_connection: int = RPC_MAX_IN_FLIGHT_PER_CONNECTION,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_per_connection = max_per_connection
+        self.in_flight = 0
+        self.calls = {lane: 0 for lane in LANES}
+        self.max_queue_depth = {lane: 0 for lane in LANES}
+        self._waiters: dict[int, deque] = {lane: deque() for lane in LANES}
+        self._connections = weakref.WeakKeyDictionary()
+
+    @contextmanager
+    def lane(self, lane: int):
+        """Run the RPCs issued within the block, including gathered tasks, in ``lane``."""
+        token = _lane.set(lane)
+        try:
+            yield
+        finally:
+            _lane.reset(token)
+
+    def queue_depth(self) -> dict[str, int]:
+        return {name: len(self._waiters[lane]) for lane, name in LANES.items()}
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": {name: self.max_queue_depth[lane] for lane, name in LANES.items()},
+            "calls": {name: self.calls[lane] for lane, name in LANES.items()},
+        }
+
+    async def _acquire(self, lane: int):
+        if self.in_flight < self.max_in_flight and not any(self._waiters.values()):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(waiter)
+        self.max_queue_depth[lane] = max(self.max_queue_depth[lane], len(self._waiters[lane]))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was already handed to us, pass it on
+                self._release()
+            elif waiter in self._waiters[lane]:
+                self._waiters[lane].remove(waiter)
+            raise
+
+    def _release(self):
+        # Hand the slot straight to the next waiter, interactive lane first
+        for lane in LANES:
+            waiters = self._waiters[lane]
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def _connection_limit(self, subtensor) -> asyncio.Semaphore:
+        semaphore = self._connections.get(subtensor)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_connection)
+            self._connections[subtensor] = semaphore
+        return semaphore
+
+    async def call(
+        self, subtensor, func, *args, timeout: float | None = None, on_start=None, **kwargs
+    ):
+        """Await ``func(*args, **kwargs)`` once slots are free on ``subtensor`` and globally.
+
+        ``timeout`` only starts once the slots are granted, time spent queued is not the
+        node's, and ``on_start`` is called at that point.
+        """
+        lane = _lane.get()
+        self.calls[lane] += 1
+        await self._acquire(lane)
+        try:
+            async with self._connection_limit(subtensor):
+                if on_start is not None:
+                    on_start()
+                return await asyncio.wait_for(func(*args, **kwargs), timeout)
+        finally:
+            self._release()
+
+
+rpc_scheduler = RpcScheduler()
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Hashable
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one in-flight computation.
+
+    The first caller starts ``func(*args)`` as a task; callers arriving while it
+    runs await the same task instead of starting their own. The task is shielded
+    so a disconnecting client does not cancel work other callers are waiting on.
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.coalesced = 0
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func, *args):
+        future = self._calls.get(key)
+        if future is None:
+            self.started += 1
+            future = asyncio.ensure_future(func(*args))
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future):
+        self._calls.pop(key, None)
+        # Mark the exception as retrieved in case every waiter went away
+        if not future.cancelled():
+            future.exception()
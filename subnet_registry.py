@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import os
+
+from errors import UnknownSubnet
+from fast_json import dumps
+from price_store import PriceStore
+from subtensor_pool import SubtensorPool, LITE
+
+
+# Seconds between reloads of the registered subnets from the chain
+SUBNET_REFRESH_INTERVAL = int(os.getenv("SUBNET_REFRESH_INTERVAL", "600"))
+
+
+def subnet_label(netuid: int, name: str | None) -> str:
+    return f"SN{netuid} - {name}" if name else f"SN{netuid}"
+
+
+async def load_subnets(pool: SubtensorPool) -> dict[int, str]:
+    """Registered netuids and their labels at the chain head."""
+    head_hash = await pool.call(LITE, "substrate.get_chain_head")
+    subnet_infos = await pool.call(LITE, "get_all_subnet_dynamic_info", head_hash)
+    return {
+        subnet_info.netuid: subnet_label(subnet_info.netuid, getattr(subnet_info, "subnet_name", None))
+        for subnet_info in subnet_infos or []
+        if subnet_info is not None
+    }
+
+
+class SubnetRegistry:
+    """Registered subnets and their labels, loaded from chain metadata.
+
+    The last loaded registry is kept in the store and used until the first
+    refresh succeeds. ``/subnets`` is served from the pre-encoded ``body`` and
+    its ``etag``, which only change when the registry does.
+    """
+
+    def __init__(
+        self,
+        pool: SubtensorPool,
+        store: PriceStore,
+        refresh_interval: float = SUBNET_REFRESH_INTERVAL,
+    ):
+        self.pool = pool
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self._task: asyncio.Task | None = None
+        # Called with the registered netuids whenever they change
+        self.listeners = []
+        self.last_error: str | None = None
+        self._set(store.get_subnets())
+
+    def _set(self, labels: dict[int, str]):
+        self.labels = dict(sorted(labels.items()))
+        self.body = dumps([{"label": label, "value": netuid} for netuid, label in self.labels.items()])
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        for listener in self.listeners:
+            listener(self.netuids())
+
+    def netuids(self) -> list[int]:
+        return list(self.labels)
+
+    def label(self, netuid: int) -> str:
+        return self.labels.get(netuid) or subnet_label(netuid, None)
+
+    def check(self, netuids: list[int]):
+        """Reject netuids that are not registered, before any RPC is made for them."""
+        # Nothing can be rejected before the registry has loaded once
+        if not self.labels:
+            return
+        unknown = [netuid for netuid in netuids if netuid not in self.labels]
+        if unknown:
+            raise UnknownSubnet(f"Unknown netuid: {', '.join(map(str, unknown))}")
+
+    async def refresh(self):
+        labels = await load_subnets(self.pool)
+        if labels and labels != self.labels:
+            self.store.put_subnets(labels)
+            self._set(labels)
+
+    async def start(self):
+        """Load the registry, then keep it refreshed in the background."""
+        try:
+            await self.refresh()
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Subnet registry load failed: {e}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
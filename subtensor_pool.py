@@ -0,0 +1,327 @@
+import asyncio
+import os
+import random
+import time
+from operator import attrgetter
+
+from btcli.bittensor_cli.src.bittensor.subtensor_interface import SubtensorInterface
+
+from metrics import registry, timed
+from rpc_scheduler import rpc_scheduler
+
+
+def _endpoints(name: str, default: list[str]) -> list[str]:
+    value = os.getenv(name, "")
+    return [endpoint.strip() for endpoint in value.split(",") if endpoint.strip()] or default
+
+
+SUBTENSOR_NETWORK = os.getenv("SUBTENSOR_NETWORK", "test")
+# Historical state queries go to archive nodes, head queries to lite nodes
+SUBTENSOR_ARCHIVE_ENDPOINTS = _endpoints("SUBTENSOR_ARCHIVE_ENDPOINTS", [SUBTENSOR_NETWORK])
+SUBTENSOR_LITE_ENDPOINTS = _endpoints("SUBTENSOR_LITE_ENDPOINTS", SUBTENSOR_ARCHIVE_ENDPOINTS)
+SUBTENSOR_POOL_SIZE = int(os.getenv("SUBTENSOR_POOL_SIZE", "4"))
+# Fixed delay in seconds before a slow call is hedged, adaptive when unset
+SUBTENSOR_HEDGE_AFTER = float(os.getenv("SUBTENSOR_HEDGE_AFTER", "0")) or None
+# Seconds before a single attempt is abandoned and retried elsewhere
+RPC_CALL_TIMEOUT = float(os.getenv("RPC_CALL_TIMEOUT", "5"))
+
+ARCHIVE = "archive"
+LITE = "lite"
+
+RPC_SECONDS = registry.histogram(
+    "rpc_call_seconds", "RPC latency including retries and hedging, per role and method"
+)
+
+
+class PooledConnection:
+    """A SubtensorInterface whose websocket stays open across requests."""
+
+    def __init__(self, network: str):
+        self.network = network
+        self.subtensor = None
+        self.last_checked = 0.0
+        self.in_flight = 0
+        self.lock = asyncio.Lock()
+
+    async def connect(self):
+        subtensor = SubtensorInterface(self.network)
+        await subtensor.__aenter__()
+        self.subtensor = subtensor
+        self.last_checked = time.monotonic()
+
+    async def close(self):
+        if self.subtensor is None:
+            return
+        try:
+            await self.subtensor.__aexit__(None, None, None)
+        except Exception:
+            pass
+        finally:
+            self.subtensor = None
+
+    async def is_healthy(self, timeout: float) -> bool:
+        if self.subtensor is None:
+            return False
+        try:
+            await asyncio.wait_for(self.subtensor.substrate.get_chain_head(), timeout)
+        except Exception:
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+
+class Endpoint:
+    """One substrate node, its connections and the latency observed against it.
+
+    Latency is tracked per method as a smoothed mean and mean deviation, the same
+    estimator TCP uses for its retransmission timeout; a block hash lookup and a
+    dynamic info query differ by orders of magnitude. Consecutive failures take
+    the node out of rotation for an exponentially growing cooldown.
+    """
+
+    def __init__(self, url: str, size: int, max_backoff: float = 30.0):
+        self.url = url
+        self.roles: set[str] = set()
+        self.connections = [PooledConnection(url) for _ in range(max(1, size))]
+        self.max_backoff = max_backoff
+        # method -> (smoothed latency, mean deviation) in seconds
+        self.latencies: dict[str, tuple[float, float]] = {}
+        self.failures = 0
+        self.down_until = 0.0
+        self.calls = 0
+        self.errors = 0
+
+    def is_up(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def weight(self, method: str) -> float:
+        # Unmeasured nodes get the benefit of the doubt so they are tried early
+        latency, _ = self.latencies.get(method, (0.0, 0.0))
+        return 1.0 / max(latency, 0.001)
+
+    def hedge_delay(self, method: str) -> float:
+        if method not in self.latencies:
+            return 1.0
+        latency, deviation = self.latencies[method]
+        return latency + 4 * deviation
+
+    def record_success(self, method: str, elapsed: float):
+        self.calls += 1
+        self.failures = 0
+        self.down_until = 0.0
+        if method not in self.latencies:
+            self.latencies[method] = (elapsed, elapsed / 2)
+        else:
+            latency, deviation = self.latencies[method]
+            deviation += (abs(elapsed - latency) - deviation) / 4
+            latency += (elapsed - latency) / 8
+            self.latencies[method] = (latency, deviation)
+
+    def record_failure(self):
+        self.calls += 1
+        self.errors += 1
+        self.failures += 1
+        self.down_until = time.monotonic() + min(0.5 * 2 ** self.failures, self.max_backoff)
+
+    def status(self) -> dict:
+        return {
+            "url": self.url,
+            "roles": sorted(self.roles),
+            "up": self.is_up(),
+            "latency_ms": {
+                method: round(latency * 1000, 1)
+                for method, (latency, _) in sorted(self.latencies.items())
+            },
+            "connected": sum(conn.subtensor is not None for conn in self.connections),
+            "calls": self.calls,
+            "errors": self.errors,
+        }
+
+
+class SubtensorPool:
+    """Persistent substrate connections to a set of archive and lite nodes.
+
+    Connections are opened once in the app startup hook and shared between
+    requests, ``rpc_scheduler`` bounds how many calls run on each of them. Every
+    call picks a node of the requested role at random, weighted towards the
+    fastest ones, and makes up to ``max_attempts`` attempts: a failed or timed
+    out attempt is retried on another node and one slower than its node usually
+    is gets hedged, preferring nodes not yet tried. A connection is health
+    checked if it has been idle for longer than ``health_check_interval`` and
+    reconnected when the check fails.
+    """
+
+    def __init__(
+        self,
+        archive_endpoints: list[str] = SUBTENSOR_ARCHIVE_ENDPOINTS,
+        lite_endpoints: list[str] = SUBTENSOR_LITE_ENDPOINTS,
+        size: int = SUBTENSOR_POOL_SIZE,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+        max_backoff: float = 30.0,
+        hedge_after: float | None = SUBTENSOR_HEDGE_AFTER,
+        call_timeout: float = RPC_CALL_TIMEOUT,
+        max_attempts: int = 3,
+    ):
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.hedge_after = hedge_after
+        self.call_timeout = call_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.hedged = 0
+        self.retried = 0
+        # A node listed under both roles shares its connections
+        self.endpoints: dict[str, Endpoint] = {}
+        self.roles: dict[str, list[Endpoint]] = {ARCHIVE: [], LITE: []}
+        for role, urls in ((ARCHIVE, archive_endpoints), (LITE, lite_endpoints)):
+            for url in dict.fromkeys(urls):
+                endpoint = self.endpoints.setdefault(url, Endpoint(url, self.size, max_backoff))
+                endpoint.roles.add(role)
+                self.roles[role].append(endpoint)
+        self._open = False
+
+    def _connections(self) -> list[PooledConnection]:
+        return [conn for endpoint in self.endpoints.values() for conn in endpoint.connections]
+
+    async def open(self):
+        """Open every connection; failures are retried lazily on first use."""
+        connections = self._connections()
+        results = await asyncio.gather(
+            *[conn.connect() for conn in connections], return_exceptions=True
+        )
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                print(f"Subtensor connection to {conn.network} failed at startup: {result}")
+        self._open = True
+
+    async def close(self):
+        self._open = False
+        await asyncio.gather(*[conn.close() for conn in self._connections()])
+
+    def status(self) -> dict:
+        return {
+            "hedged": self.hedged,
+            "retried": self.retried,
+            "endpoints": [endpoint.status() for endpoint in self.endpoints.values()],
+        }
+
+    def _pick(self, role: str, method: str, tried: set[Endpoint]) -> Endpoint:
+        candidates = [
+            endpoint for endpoint in self.roles[role] if endpoint not in tried
+        ] or self.roles[role]
+        # With every node cooling down, the least recently failed one is still worth a try
+        up = [endpoint for endpoint in candidates if endpoint.is_up()]
+        if not up:
+            return min(candidates, key=lambda endpoint: endpoint.down_until)
+        return random.choices(up, weights=[endpoint.weight(method) for endpoint in up])[0]
+
+    def _untried_up(self, role: str, tried: set[Endpoint]) -> bool:
+        return any(endpoint.is_up() for endpoint in self.roles[role] if endpoint not in tried)
+
+    async def _ready(self, endpoint: Endpoint) -> PooledConnection:
+        conn = min(endpoint.connections, key=lambda conn: conn.in_flight)
+        async with conn.lock:
+            if conn.subtensor is None:
+                await conn.connect()
+            elif time.monotonic() - conn.last_checked > self.health_check_interval:
+                if not await conn.is_healthy(self.health_check_timeout):
+                    await conn.close()
+                    await conn.connect()
+        return conn
+
+    async def _attempt(self, endpoint: Endpoint, method: str, args: tuple, started: asyncio.Event):
+        """One attempt, ``started`` is set once it leaves the scheduler's queue."""
+        started_at = None
+
+        def on_start():
+            nonlocal started_at
+            started_at = time.monotonic()
+            started.set()
+
+        try:
+            conn = await asyncio.wait_for(self._ready(endpoint), self.call_timeout)
+            conn.in_flight += 1
+            try:
+                result = await rpc_scheduler.call(
+                    conn.subtensor, attrgetter(method)(conn.subtensor), *args,
+                    timeout=self.call_timeout,
+                    on_start=on_start,
+                )
+            except Exception:
+                # Force a health check before the connection is used again
+                conn.last_checked = 0.0
+                raise
+            finally:
+                conn.in_flight -= 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            endpoint.record_failure()
+            raise
+        # Measured from the slot grant, queueing says nothing about the node
+        endpoint.record_success(method, time.monotonic() - started_at)
+        return result
+
+    async def call(self, role: str, method: str, *args):
+        """Await ``subtensor.<method>(*args)`` on a node of ``role``, e.g. ``"substrate.get_block_hash"``."""
+        if not self._open:
+            raise RuntimeError("Subtensor pool is not open")
+        with timed(RPC_SECONDS, "rpc", role=role, method=method):
+            return await self._call(role, method, args)
+
+    async def _call(self, role: str, method: str, args: tuple):
+        tried: set[Endpoint] = set()
+        attempts: set[asyncio.Task] = set()
+
+        def launch() -> tuple[Endpoint, asyncio.Event]:
+            endpoint = self._pick(role, method, tried)
+            tried.add(endpoint)
+            started = asyncio.Event()
+            attempts.add(asyncio.ensure_future(self._attempt(endpoint, method, args, started)))
+            return endpoint, started
+
+        primary, primary_started = launch()
+        hedge_after = self.hedge_after or primary.hedge_delay(method)
+        launched = 1
+        try:
+            while True:
+                if hedge_after is not None and not primary_started.is_set():
+                    # A call still queued for a slot is not a straggler, time it once it runs
+                    started = asyncio.ensure_future(primary_started.wait())
+                    try:
+                        await asyncio.wait(attempts | {started}, return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        started.cancel()
+                done, _ = await asyncio.wait(
+                    attempts, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Only the first attempt is hedged, later ones are already retries
+                hedge_after = None
+                if not done:
+                    # A straggler: race it against another attempt on a node not yet tried,
+                    # first answer wins. Not while calls are queued, a hedge would only wait
+                    # behind them, nor on the same node, it would only add load there.
+                    if (
+                        launched < self.max_attempts
+                        and self._untried_up(role, tried)
+                        and not any(rpc_scheduler.queue_depth().values())
+                    ):
+                        launch()
+                        launched += 1
+                        self.hedged += 1
+                    continue
+                for task in done:
+                    attempts.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not attempts:
+                    if launched >= self.max_attempts:
+                        raise error
+                    launch()
+                    launched += 1
+                    self.retried += 1
+        finally:
+            for task in attempts:
+                task.cancel()
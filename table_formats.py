@@ -0,0 +1,70 @@
+import gzip
+import io
+
+import pandas as pd
+
+from errors import InvalidRequest
+
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Text formats are gzip'ed as a Content-Encoding, binary formats use their own codecs
+COMPRESSIONS = {
+    "json": {None, "gzip"},
+    "csv": {None, "gzip"},
+    "parquet": {None, "snappy", "gzip", "zstd", "brotli", "lz4"},
+    "arrow": {None, "lz4", "zstd"},
+}
+
+
+def check_format(fmt: str, compression: str | None):
+    """Reject unknown formats and codecs before any work is done."""
+    if fmt not in MEDIA_TYPES:
+        raise InvalidRequest(f"Unknown format: {fmt}")
+    if compression not in COMPRESSIONS[fmt]:
+        raise InvalidRequest(f"Unsupported compression for {fmt}: {compression}")
+
+
+def content_headers(fmt: str, compression: str | None) -> dict:
+    """Headers describing a body produced by ``encode_table``."""
+    if compression == "gzip" and fmt in ("json", "csv"):
+        return {"Content-Encoding": "gzip"}
+    return {}
+
+
+def encode_table(
+    table: pd.DataFrame, fmt: str, compression: str | None = None, double_precision: int = 10
+) -> bytes:
+    """Encode a table straight from its columns, without per-row Python objects.
+
+    ``double_precision`` is the number of decimal places kept in JSON.
+    """
+    check_format(fmt, compression)
+
+    if fmt == "json":
+        # Prices are whole rao (1e-9 TAO), so 10 decimal places are exact for price tables
+        body = table.to_json(orient="records", double_precision=double_precision).encode()
+    elif fmt == "csv":
+        body = table.to_csv(index=False).encode()
+    elif fmt == "parquet":
+        buffer = io.BytesIO()
+        table.to_parquet(buffer, index=False, compression=compression)
+        body = buffer.getvalue()
+    else:
+        import pyarrow as pa
+
+        arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.ipc.new_stream(sink, arrow_table.schema, options=options) as writer:
+            writer.write_table(arrow_table)
+        body = sink.getvalue().to_pybytes()
+
+    if content_headers(fmt, compression):
+        body = gzip.compress(body)
+    return body
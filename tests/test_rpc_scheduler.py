@@ -0,0 +1,24 @@
+import asyncio
+
+from rpc_scheduler import RpcScheduler
+
+
+class Connection:
+    pass
+
+
+def test_timeout_excludes_queue_time():
+    scheduler = RpcScheduler(max_in_flight=1)
+
+    async def rpc():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run():
+        connection = Connection()
+        # Each call fits its timeout, but the last ones queue for longer than that
+        return await asyncio.gather(*[
+            scheduler.call(connection, rpc, timeout=0.08) for _ in range(4)
+        ])
+
+    assert asyncio.run(run()) == ["ok"] * 4
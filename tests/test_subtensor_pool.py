@@ -0,0 +1,60 @@
+import asyncio
+
+import subtensor_pool
+from subtensor_pool import SubtensorPool, LITE
+
+
+class FakeSubstrate:
+    def __init__(self, network: str):
+        self.network = network
+
+    async def get_chain_head(self):
+        return f"0x{self.network}"
+
+    async def get_block_hash(self, block: int):
+        await asyncio.sleep(0.05)
+        return f"0x{block:x}"
+
+
+class FakeSubtensorInterface:
+    def __init__(self, network: str):
+        self.substrate = FakeSubstrate(network)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+def test_call_with_fixed_hedge_after(monkeypatch):
+    monkeypatch.setattr(subtensor_pool, "SubtensorInterface", FakeSubtensorInterface)
+
+    async def run():
+        pool = SubtensorPool(["node"], ["node"], size=1, hedge_after=0.5)
+        await pool.open()
+        try:
+            return await pool.call(LITE, "substrate.get_chain_head"), pool.status()
+        finally:
+            await pool.close()
+
+    head, status = asyncio.run(run())
+    assert head == "0xnode"
+    assert status["hedged"] == 0
+    assert status["retried"] == 0
+
+
+def test_no_hedge_on_the_only_node(monkeypatch):
+    monkeypatch.setattr(subtensor_pool, "SubtensorInterface", FakeSubtensorInterface)
+
+    async def run():
+        pool = SubtensorPool(["node"], ["node"], size=1, hedge_after=0.01)
+        await pool.open()
+        try:
+            return await pool.call(LITE, "substrate.get_block_hash", 16), pool.status()
+        finally:
+            await pool.close()
+
+    block_hash, status = asyncio.run(run())
+    assert block_hash == "0x10"
+    assert status["hedged"] == 0
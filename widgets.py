@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+
+from fastapi.routing import APIRoute
+
+from fast_json import dumps
+
+
+def route_widgets(routes) -> dict:
+    """Widgets declared on the routes themselves, as ``openapi_extra={"widget_config": {...}}``.
+
+    The widget id and ``endpoint`` default to the route path, the name and
+    description to the route's summary and docstring.
+    """
+    widgets = {}
+    for route in routes:
+        if not isinstance(route, APIRoute) or "widget_config" not in (route.openapi_extra or {}):
+            continue
+        endpoint = route.path.strip("/")
+        description = (route.description or "").strip().splitlines()
+        widgets[endpoint] = {
+            "name": route.summary or route.name.replace("_", " ").title(),
+            "description": description[0] if description else "",
+            "endpoint": endpoint,
+            **route.openapi_extra["widget_config"],
+        }
+    return widgets
+
+
+def check_widgets(widgets: dict, endpoints: set[str]):
+    """Reject widgets that would render broken, e.g. pointing at an endpoint that does not exist."""
+    if not isinstance(widgets, dict):
+        raise ValueError("widgets.json must be an object of widget id -> widget")
+    for widget_id, widget in widgets.items():
+        if not isinstance(widget, dict):
+            raise ValueError(f"Widget {widget_id} is not an object")
+        for field in ("name", "endpoint"):
+            if not widget.get(field):
+                raise ValueError(f"Widget {widget_id} has no {field}")
+        if widget["endpoint"] not in endpoints:
+            raise ValueError(f"Widget {widget_id} uses unknown endpoint {widget['endpoint']}")
+        for param in widget.get("params", []):
+            options = param.get("optionsEndpoint")
+            if options is not None and options not in endpoints:
+                raise ValueError(f"Widget {widget_id} takes options from unknown endpoint {options}")
+
+
+class WidgetConfig:
+    """The widgets.json response, encoded once and reloaded when the file changes.
+
+    Widgets declared on routes are merged under the ones in the file, so a new
+    endpoint only needs its ``widget_config``. A file that fails validation on
+    reload is reported and the previous configuration keeps being served.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.routes = []
+        self.mtime: float | None = None
+        self.body = b"{}"
+        self.etag = '""'
+        self.last_error: str | None = None
+
+    def load(self, routes):
+        """Build the configuration from ``routes`` and the file, raising if it is invalid."""
+        self.routes = routes
+        self._reload()
+
+    def _reload(self):
+        mtime = os.stat(self.path).st_mtime if os.path.exists(self.path) else None
+        widgets = route_widgets(self.routes)
+        if mtime is not None:
+            with open(self.path) as f:
+                configured = json.load(f)
+            # Checked before merging, update() would raise a TypeError on a list
+            if not isinstance(configured, dict):
+                raise ValueError("widgets.json must be an object of widget id -> widget")
+            widgets.update(configured)
+        check_widgets(widgets, {
+            route.path.strip("/") for route in self.routes
+            if isinstance(route, APIRoute) and "GET" in route.methods
+        })
+
+        self.body = dumps(widgets)
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        self.mtime = mtime
+        self.last_error = None
+
+    def current(self) -> "WidgetConfig":
+        """Reload first if the file changed since it was last read."""
+        mtime = os.stat(self.path).st_mtime if os.path.exists(self.path) else None
+        if mtime != self.mtime:
+            try:
+                self._reload()
+            except (OSError, ValueError) as e:
+                # Do not retry an invalid file on every request, only once it changes again
+                self.mtime = mtime
+                self.last_error = str(e)
+                print(f"widgets.json reload failed, serving the previous version: {e}")
+        return self